@@ -0,0 +1,220 @@
+"""Benchmark VideoProcessor end to end and per stage on synthetic footage.
+
+Usage:
+    python -m benchmarks.bench_pipeline --output bench.json
+    python -m benchmarks.bench_pipeline --baseline bench-baseline.json --tolerance 0.25
+
+Exits with status 1 when any tracked metric regresses beyond the tolerance
+relative to the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import cv2
+
+from app.core.metrics import StageTimer
+from app.models.registry import PoseModelRegistry
+from app.pipelines.video_processor import VideoProcessor
+from app.schemas.pose import ProcessingConfig
+from benchmarks.synthetic import write_synthetic_video
+
+# Each scenario overrides ProcessingConfig fields on top of the selected model.
+SCENARIOS: dict[str, dict[str, Any]] = {
+    "every_frame": {},
+    "every_3_frames": {"every_n_frames": 3},
+    "downscaled_640x360": {"output_resolution": "640x360"},
+    "intermediate_frames": {"save_intermediate_frames": True},
+}
+
+_COLD_CREATE_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from app.models.registry import PoseModelRegistry
+imported = time.perf_counter()
+PoseModelRegistry().create(sys.argv[1])
+done = time.perf_counter()
+print(json.dumps({"import_seconds": imported - start, "create_seconds": done - imported}))
+"""
+
+
+def bench_scenario(
+    processor: VideoProcessor,
+    video_path: Path,
+    workdir: Path,
+    config: ProcessingConfig,
+    repeat: int,
+) -> dict[str, Any]:
+    totals: list[float] = []
+    stages: dict[str, list[float]] = {}
+    frames = 0
+    for i in range(repeat):
+        timer = StageTimer()
+        start = time.perf_counter()
+        processor.process_video(
+            video_id="bench",
+            input_path=video_path,
+            output_dir=workdir / f"run-{i}",
+            config=config,
+            timer=timer,
+        )
+        totals.append(time.perf_counter() - start)
+        frames = timer.frames
+        for stage, seconds in timer.totals.items():
+            stages.setdefault(stage, []).append(seconds)
+
+    total = statistics.median(totals)
+    return {
+        "total_seconds": total,
+        "frames": frames,
+        "frames_per_second": frames / total if total > 0 else 0.0,
+        "stages": {stage: statistics.median(values) for stage, values in sorted(stages.items())},
+    }
+
+
+def bench_registry(model: str, repeat: int) -> dict[str, float]:
+    # A fresh interpreter is the only honest way to measure import + first load.
+    cold = subprocess.run(
+        [sys.executable, "-c", _COLD_CREATE_SNIPPET, model],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    cold_result = json.loads(cold.stdout.strip().splitlines()[-1])
+
+    registry = PoseModelRegistry()
+    registry.warm(model)
+    warm_create: list[float] = []
+    warm_acquire: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        registry.create(model)
+        warm_create.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        registry.release(model, registry.acquire(model))
+        warm_acquire.append(time.perf_counter() - start)
+
+    return {
+        "cold_import_seconds": cold_result["import_seconds"],
+        "cold_create_seconds": cold_result["create_seconds"],
+        "warm_create_seconds": statistics.median(warm_create),
+        "warm_acquire_seconds": statistics.median(warm_acquire),
+    }
+
+
+def flatten(report: dict[str, Any]) -> dict[str, float]:
+    """Map a report to the lower-is-better metrics compared against a baseline."""
+    flat: dict[str, float] = {}
+    for name, result in report["scenarios"].items():
+        flat[f"scenarios.{name}.total_seconds"] = result["total_seconds"]
+        for stage, seconds in result["stages"].items():
+            flat[f"scenarios.{name}.stages.{stage}"] = seconds
+    for key, seconds in report["registry"].items():
+        flat[f"registry.{key}"] = seconds
+    return flat
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float,
+    min_seconds: float = 0.005,
+) -> list[dict[str, Any]]:
+    """Return metrics slower than baseline by more than ``tolerance`` (a ratio, 0.2 = 20%).
+
+    Metrics faster than ``min_seconds`` in the baseline are ignored; they are
+    dominated by timer noise.
+    """
+    regressions: list[dict[str, Any]] = []
+    base = flatten(baseline)
+    for key, value in flatten(current).items():
+        reference = base.get(key)
+        if reference is None or reference < min_seconds:
+            continue
+        ratio = value / reference
+        if ratio > 1.0 + tolerance:
+            regressions.append({"metric": key, "baseline": reference, "current": value, "ratio": ratio})
+    return regressions
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    registry = PoseModelRegistry()
+    processor = VideoProcessor(registry=registry, max_video_seconds=int(args.seconds) + 60)
+    width, height = (int(v) for v in args.resolution.lower().split("x", maxsplit=1))
+
+    with tempfile.TemporaryDirectory(prefix="betagen-bench-") as tmp:
+        workdir = Path(tmp)
+        video_path = write_synthetic_video(
+            workdir / "input.mp4", seconds=args.seconds, width=width, height=height, fps=args.fps
+        )
+        # Load once up front so import and first-load cost stay out of scenario numbers.
+        registry.warm(args.model)
+
+        scenarios: dict[str, Any] = {}
+        for name, overrides in SCENARIOS.items():
+            if args.scenario and name not in args.scenario:
+                continue
+            config = ProcessingConfig(model=args.model, **overrides)
+            scenarios[name] = bench_scenario(processor, video_path, workdir / name, config, args.repeat)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "opencv": cv2.__version__,
+            "model": args.model,
+            "video": {"seconds": args.seconds, "resolution": args.resolution, "fps": args.fps},
+            "repeat": args.repeat,
+        },
+        "scenarios": scenarios,
+        "registry": bench_registry(args.model, args.repeat),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="mediapipe")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--resolution", default="1280x720")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="compare against a previous JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        for item in regressions:
+            print(
+                f"REGRESSION {item['metric']}: {item['baseline']:.4f}s -> {item['current']:.4f}s "
+                f"({item['ratio']:.2f}x)",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
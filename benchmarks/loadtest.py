@@ -0,0 +1,234 @@
+"""Concurrent API load test against the in-process FastAPI app with a stub pose model.
+
+Each simulated client uploads a synthetic clip, starts processing with the
+``stub`` model, polls ``/jobs/{job_id}`` until it finishes and downloads both
+artifacts. Inference cost is replaced by a deterministic sleep so the numbers
+reflect scheduling and I/O rather than the model.
+
+Usage:
+    python -m benchmarks.loadtest --clients 50 --concurrency 50 --stub-latency-ms 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from app.api.deps import get_job_manager
+from app.main import app
+from app.models.base_model import BasePoseModel
+from app.schemas.pose import PoseKeypoint, PoseResult
+from app.services.job_manager import JobManager
+from benchmarks.synthetic import write_synthetic_video
+
+if TYPE_CHECKING:
+    from app.models.base_model import Frame
+
+API_PREFIX = "/api/v1"
+
+
+class StubPoseModel(BasePoseModel):
+    """Deterministic pose model whose inference cost is a fixed sleep."""
+
+    name = "stub"
+
+    def __init__(self, latency_seconds: float = 0.0, load_seconds: float = 0.0) -> None:
+        self.latency_seconds = latency_seconds
+        self.load_seconds = load_seconds
+
+    def load_model(self) -> None:
+        if self.load_seconds:
+            time.sleep(self.load_seconds)
+
+    def infer(self, frame: Frame) -> PoseResult:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        h, w = frame.shape[:2]
+        keypoints = [
+            PoseKeypoint(name="11", x=0.4 * w, y=0.3 * h, confidence=0.9),
+            PoseKeypoint(name="12", x=0.6 * w, y=0.3 * h, confidence=0.9),
+            PoseKeypoint(name="23", x=0.45 * w, y=0.6 * h, confidence=0.9),
+            PoseKeypoint(name="24", x=0.55 * w, y=0.6 * h, confidence=0.9),
+        ]
+        return PoseResult(keypoints=keypoints, confidence=0.9, bbox=[0.3 * w, 0.2 * h, 0.7 * w, 0.8 * h])
+
+    def visualize(self, frame: Frame, pose_result: PoseResult) -> Frame:
+        return frame
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Linear-interpolated percentile, ``q`` in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    return {
+        "count": len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples, default=0.0),
+    }
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, video_bytes: bytes, poll_interval: float) -> None:
+        self.client = client
+        self.video_bytes = video_bytes
+        self.poll_interval = poll_interval
+        self.latencies: dict[str, list[float]] = {}
+        self.job_seconds: list[float] = []
+        self.failures: list[str] = []
+
+    async def _request(self, endpoint: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        self.latencies.setdefault(endpoint, []).append(time.perf_counter() - start)
+        response.raise_for_status()
+        return response
+
+    async def run_client(self) -> None:
+        try:
+            upload = await self._request(
+                "upload",
+                "POST",
+                f"{API_PREFIX}/videos/upload",
+                files={"file": ("clip.mp4", self.video_bytes, "video/mp4")},
+            )
+            video_id = upload.json()["video_id"]
+
+            started = time.perf_counter()
+            process = await self._request(
+                "process", "POST", f"{API_PREFIX}/videos/{video_id}/process", params={"model": "stub"}
+            )
+            job_id = process.json()["job_id"]
+
+            while True:
+                status = (await self._request("job_status", "GET", f"{API_PREFIX}/jobs/{job_id}")).json()
+                if status["status"] == "completed":
+                    break
+                if status["status"] == "failed":
+                    raise RuntimeError(status["error"])
+                await asyncio.sleep(self.poll_interval)
+            self.job_seconds.append(time.perf_counter() - started)
+
+            for file_type in ("keypoints", "overlay"):
+                await self._request(
+                    f"download_{file_type}",
+                    "GET",
+                    f"{API_PREFIX}/videos/{video_id}/download",
+                    params={"type": file_type},
+                )
+        except Exception as exc:
+            self.failures.append(f"{type(exc).__name__}: {exc}")
+
+
+async def run_load_test(
+    manager: JobManager,
+    video_bytes: bytes,
+    clients: int,
+    concurrency: int,
+    poll_interval: float,
+) -> dict[str, Any]:
+    app.dependency_overrides[get_job_manager] = lambda: manager
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            test = LoadTest(client, video_bytes, poll_interval)
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def bounded() -> None:
+                async with semaphore:
+                    await test.run_client()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(bounded() for _ in range(clients)))
+            elapsed = time.perf_counter() - start
+    finally:
+        app.dependency_overrides.pop(get_job_manager, None)
+
+    requests = sum(len(samples) for samples in test.latencies.values())
+    return {
+        "clients": clients,
+        "concurrency": concurrency,
+        "elapsed_seconds": elapsed,
+        "requests": requests,
+        "requests_per_second": requests / elapsed if elapsed > 0 else 0.0,
+        "jobs_completed": len(test.job_seconds),
+        "jobs_per_second": len(test.job_seconds) / elapsed if elapsed > 0 else 0.0,
+        "job_completion_seconds": summarize(test.job_seconds),
+        "endpoints": {name: summarize(samples) for name, samples in sorted(test.latencies.items())},
+        "failures": test.failures,
+    }
+
+
+def build_manager(root: Path, stub_factory: Callable[[], BasePoseModel]) -> JobManager:
+    manager = JobManager(
+        uploads_dir=root / "uploads",
+        outputs_dir=root / "outputs",
+        default_every_n_frames=1,
+        default_output_resolution="original",
+        default_save_intermediate_frames=False,
+        max_video_seconds=600,
+    )
+    manager.registry.register("stub", stub_factory)
+    return manager
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50, help="total upload->download sessions")
+    parser.add_argument("--concurrency", type=int, default=50, help="sessions in flight at once")
+    parser.add_argument("--stub-latency-ms", type=float, default=5.0, help="sleep per inferred frame")
+    parser.add_argument("--stub-load-ms", type=float, default=0.0, help="sleep per model load")
+    parser.add_argument("--poll-interval-ms", type=float, default=50.0)
+    parser.add_argument("--seconds", type=float, default=1.0, help="synthetic clip length")
+    parser.add_argument("--resolution", default="640x360")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    width, height = (int(v) for v in args.resolution.lower().split("x", maxsplit=1))
+    with tempfile.TemporaryDirectory(prefix="betagen-load-") as tmp:
+        root = Path(tmp)
+        clip = write_synthetic_video(
+            root / "clip.mp4", seconds=args.seconds, width=width, height=height, fps=args.fps
+        )
+        manager = build_manager(
+            root,
+            lambda: StubPoseModel(args.stub_latency_ms / 1000.0, args.stub_load_ms / 1000.0),
+        )
+        report = asyncio.run(
+            run_load_test(
+                manager,
+                clip.read_bytes(),
+                clients=args.clients,
+                concurrency=args.concurrency,
+                poll_interval=args.poll_interval_ms / 1000.0,
+            )
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+
+def write_synthetic_video(
+    path: Path,
+    seconds: float = 2.0,
+    width: int = 640,
+    height: int = 360,
+    fps: float = 30.0,
+    codec: str = "mp4v",
+) -> Path:
+    """Write a clip with a moving stick figure over a textured wall.
+
+    The content changes every frame so decode/encode costs resemble real footage
+    rather than a trivially compressible still.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*codec), fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"Failed to open synthetic video writer for {path}")
+
+    rng = np.random.default_rng(0)
+    wall = rng.integers(60, 120, size=(height, width, 3), dtype=np.uint8)
+    for _ in range(max(8, (width * height) // 20000)):
+        center = (int(rng.integers(0, width)), int(rng.integers(0, height)))
+        color = tuple(int(c) for c in rng.integers(0, 255, size=3))
+        cv2.circle(wall, center, int(rng.integers(4, 14)), color, -1)
+
+    n_frames = max(1, int(round(seconds * fps)))
+    try:
+        for i in range(n_frames):
+            t = i / fps
+            frame = wall.copy()
+            cx = int(width * (0.3 + 0.4 * (0.5 + 0.5 * math.sin(t))))
+            cy = int(height * (0.7 - 0.4 * (i / n_frames)))
+            scale = height / 8
+            hip = (cx, cy)
+            neck = (cx, int(cy - 1.5 * scale))
+            reach = 0.8 * scale * math.sin(2 * t)
+            limbs = [
+                (neck, (int(cx - scale), int(neck[1] - scale + reach))),
+                (neck, (int(cx + scale), int(neck[1] - scale - reach))),
+                (hip, (int(cx - 0.7 * scale), int(cy + 1.2 * scale))),
+                (hip, (int(cx + 0.7 * scale), int(cy + 1.2 * scale - reach))),
+                (hip, neck),
+            ]
+            for start, end in limbs:
+                cv2.line(frame, start, end, (240, 240, 240), max(2, width // 160))
+            cv2.circle(frame, (cx, int(neck[1] - 0.5 * scale)), int(0.35 * scale), (230, 200, 180), -1)
+            writer.write(frame)
+    finally:
+        writer.release()
+    return path
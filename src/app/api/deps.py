@@ -1,12 +1,29 @@
 from functools import lru_cache
 
+from fastapi import Depends
+
 from app.core.config import get_settings
+from app.services.climb_metrics import ClimbMetricsService
 from app.services.job_manager import JobManager
+from app.services.job_queue import SQLiteJobQueue
+from app.services.similarity import SimilarityIndex
+
+
+@lru_cache
+def get_job_queue() -> SQLiteJobQueue:
+    settings = get_settings()
+    return SQLiteJobQueue(
+        settings.job_queue_file,
+        stale_seconds=settings.job_stale_seconds,
+        max_attempts=settings.job_max_attempts,
+    )
 
 
 @lru_cache
 def get_job_manager() -> JobManager:
     settings = get_settings()
+    if settings.job_backend not in ("thread", "queue"):
+        raise ValueError(f"Unknown job backend '{settings.job_backend}'")
     return JobManager(
         uploads_dir=settings.uploads_dir,
         outputs_dir=settings.outputs_dir,
@@ -14,4 +31,22 @@ def get_job_manager() -> JobManager:
         default_output_resolution=settings.pose_output_resolution,
         default_save_intermediate_frames=settings.pose_save_intermediate_frames,
         max_video_seconds=settings.pose_max_video_seconds,
+        local_registration_mode=settings.local_registration_mode,
+        local_verify=settings.local_verify,
+        preview_every_n_frames=settings.pose_preview_every_n_frames,
+        preview_resolution=settings.pose_preview_resolution,
+        job_queue=get_job_queue() if settings.job_backend == "queue" else None,
     )
+
+
+@lru_cache(maxsize=8)
+def get_climb_metrics_service(manager: JobManager = Depends(get_job_manager)) -> ClimbMetricsService:
+    return ClimbMetricsService(outputs_dir=manager.outputs_dir)
+
+
+@lru_cache(maxsize=8)
+def get_similarity_index(manager: JobManager = Depends(get_job_manager)) -> SimilarityIndex:
+    index = SimilarityIndex(outputs_dir=manager.outputs_dir)
+    index.sync_in_background()
+    manager.add_completion_listener(lambda job: index.update(job.video_id))
+    return index
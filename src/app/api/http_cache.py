@@ -0,0 +1,241 @@
+"""Conditional GET, byte ranges and precompressed variants for API responses.
+
+File ETags are derived from size and mtime, which change whenever an artifact
+is rewritten (outputs are replaced atomically). Compressed variants are cached
+as sidecar files next to the original (``keypoints.json.gz``) and are only
+reused while their mtime matches the original's.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import importlib.util
+import os
+import uuid
+from collections.abc import Iterator
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+MIN_COMPRESS_BYTES = 1024
+CHUNK_SIZE = 64 * 1024
+SIDECAR_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+
+
+def file_version(stat: os.stat_result) -> str:
+    return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison as required for If-None-Match."""
+    if header.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == target for tag in header.split(","))
+
+
+def _not_modified(request: Request, etag: str, mtime: float | None = None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if mtime is None or not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return int(mtime) <= since
+
+
+def _accepted_encodings(request: Request) -> set[str]:
+    accepted: set[str] = set()
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+def _zstd_available() -> bool:
+    return importlib.util.find_spec("zstandard") is not None
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _negotiate_encoding(request: Request) -> str | None:
+    accepted = _accepted_encodings(request)
+    if "zstd" in accepted and _zstd_available():
+        return "zstd"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compressed_sidecar(path: Path, stat: os.stat_result, encoding: str) -> Path:
+    """Return a compressed copy of ``path``, (re)building it when the original changed."""
+    sidecar = path.with_name(path.name + SIDECAR_SUFFIXES[encoding])
+    try:
+        if sidecar.stat().st_mtime_ns == stat.st_mtime_ns:
+            return sidecar
+    except FileNotFoundError:
+        pass
+
+    partial = path.with_name(f".{sidecar.name}.{uuid.uuid4().hex}.partial")
+    try:
+        partial.write_bytes(_compress(path.read_bytes(), encoding))
+        os.utime(partial, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(partial, sidecar)
+    finally:
+        partial.unlink(missing_ok=True)
+    return sidecar
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single ``bytes=`` range into inclusive offsets.
+
+    Returns None when the header should be ignored (malformed or multiple
+    ranges, which are answered with the full body) and raises ValueError when
+    the range cannot be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = (part.strip() for part in spec.partition("-"))
+    if not sep or not (first or last) or not all(part.isdigit() for part in (first, last) if part):
+        return None
+    if size == 0:
+        raise ValueError(header)
+    if not first:
+        suffix = int(last)
+        if suffix == 0:
+            raise ValueError(header)
+        return max(0, size - suffix), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise ValueError(header)
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def _if_range_matches(request: Request, etag: str, last_modified: str) -> bool:
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith(('"', "W/")):
+        return if_range == etag  # strong comparison
+    return if_range == last_modified
+
+
+def _iter_file(path: Path, start: int, length: int) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    filename: str,
+    *,
+    version: str | None = None,
+    compress: bool = False,
+) -> Response:
+    """Serve ``path`` with validators, single byte-range support and optional compression.
+
+    When ``version`` matches the file's current version the response is marked
+    immutable, so clients can cache versioned URLs forever; any other request
+    must revalidate with the ETag.
+    """
+    stat = path.stat()
+    current = file_version(stat)
+    last_modified = formatdate(stat.st_mtime, usegmt=True)
+    headers = {
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if version == current else REVALIDATE_CACHE_CONTROL,
+        "Last-Modified": last_modified,
+    }
+    if compress:
+        headers["Vary"] = "Accept-Encoding"
+
+    range_header = request.headers.get("range")
+    encoding = None
+    if compress and range_header is None and stat.st_size >= MIN_COMPRESS_BYTES:
+        encoding = _negotiate_encoding(request)
+
+    etag = f'"{current}-{encoding}"' if encoding else f'"{current}"'
+    headers["ETag"] = etag
+    if _not_modified(request, etag, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        sidecar = compressed_sidecar(path, stat, encoding)
+        return FileResponse(sidecar, media_type=media_type, filename=filename, headers=headers)
+
+    headers["Accept-Ranges"] = "bytes"
+    if range_header is None:
+        return FileResponse(path, media_type=media_type, filename=filename, headers=headers, stat_result=stat)
+
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    byte_range = None
+    if _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = _parse_range(range_header, stat.st_size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{stat.st_size}"
+            return Response(status_code=416, headers=headers)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(stat.st_size)
+        return StreamingResponse(_iter_file(path, 0, stat.st_size), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _iter_file(path, start, end - start + 1),
+        status_code=206,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+def json_response(request: Request, payload: BaseModel) -> Response:
+    """Serialize ``payload`` with a content-hash ETag, answering 304 when the client is current."""
+    body = payload.model_dump_json().encode("utf-8")
+    headers = {
+        "ETag": f'"{hashlib.sha1(body, usedforsecurity=False).hexdigest()}"',
+        "Cache-Control": REVALIDATE_CACHE_CONTROL,
+    }
+    if _not_modified(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
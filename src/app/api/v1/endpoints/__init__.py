@@ -1,3 +1,3 @@
-from . import analysis, climbs, health, jobs, videos
+from . import analysis, batches, climbs, health, jobs, metrics, videos
 
-__all__ = ["analysis", "climbs", "health", "jobs", "videos"]
+__all__ = ["analysis", "batches", "climbs", "health", "jobs", "metrics", "videos"]
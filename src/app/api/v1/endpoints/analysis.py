@@ -1,7 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query
 
-from app.schemas.analysis import AnalyzeRequest, AnalyzeResponse
+from app.api.deps import get_climb_metrics_service
+from app.schemas.analysis import AnalyzeRequest, AnalyzeResponse, ClimbMetricsResponse
 from app.services.analyzer import MockAnalysisService
+from app.services.climb_metrics import ClimbMetricsService
 
 router = APIRouter(prefix="/analysis", tags=["analysis"])
 service = MockAnalysisService()
@@ -10,3 +12,15 @@ service = MockAnalysisService()
 @router.post("/mock", response_model=AnalyzeResponse)
 def analyze_mock(payload: AnalyzeRequest) -> AnalyzeResponse:
     return service.analyze(payload)
+
+
+@router.get("/videos/{video_id}", response_model=ClimbMetricsResponse)
+def analyze_video(
+    video_id: str,
+    model: str | None = Query(default=None),
+    metrics: ClimbMetricsService = Depends(get_climb_metrics_service),
+) -> ClimbMetricsResponse:
+    try:
+        return metrics.analyze_video(video_id, model=model)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from None
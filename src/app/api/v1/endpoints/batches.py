@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.deps import get_job_manager
+from app.schemas.pose import (
+    BatchProcessRequest,
+    BatchProcessResponse,
+    BatchStatusResponse,
+    StartProcessResponse,
+)
+from app.services.job_manager import JobManager
+from app.services.local_sources import SourceChangedError
+
+router = APIRouter(prefix="/batches", tags=["batches"])
+
+
+@router.post("", response_model=BatchProcessResponse)
+def start_batch(
+    payload: BatchProcessRequest,
+    manager: JobManager = Depends(get_job_manager),
+) -> BatchProcessResponse:
+    try:
+        batch, records = manager.start_batch(payload.items)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from None
+    except SourceChangedError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+    return BatchProcessResponse(
+        batch_id=batch.batch_id,
+        jobs=[
+            StartProcessResponse(job_id=record.job_id, video_id=record.video_id, status=record.status)
+            for record in records
+        ],
+    )
+
+
+@router.get("/{batch_id}", response_model=BatchStatusResponse)
+def get_batch_status(
+    batch_id: str,
+    manager: JobManager = Depends(get_job_manager),
+) -> BatchStatusResponse:
+    try:
+        batch = manager.get_batch(batch_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Batch not found") from None
+    return manager.batch_to_response(batch)
@@ -1,4 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.deps import get_similarity_index
+from app.schemas.climbs import SimilarClimbsResponse
+from app.services.similarity import SimilarityIndex
 
 router = APIRouter(prefix="/climbs", tags=["climbs"])
 
@@ -9,3 +13,15 @@ def sample_climbs() -> list[dict[str, str]]:
         {"id": "c1", "name": "Blue Arete", "setter": "Team A"},
         {"id": "c2", "name": "Red Slab", "setter": "Team B"},
     ]
+
+
+@router.get("/{video_id}/similar", response_model=SimilarClimbsResponse)
+def similar_climbs(
+    video_id: str,
+    k: int = Query(default=5, ge=1, le=100),
+    index: SimilarityIndex = Depends(get_similarity_index),
+) -> SimilarClimbsResponse:
+    try:
+        return index.query(video_id, k=k)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="No indexed pose sequence for this video") from None
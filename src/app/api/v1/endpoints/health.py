@@ -1,4 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from app.api.deps import get_job_manager
+from app.services.job_manager import JobManager
 
 router = APIRouter(tags=["health"])
 
@@ -6,3 +10,14 @@ router = APIRouter(tags=["health"])
 @router.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/health/ready")
+def ready(manager: JobManager = Depends(get_job_manager)) -> JSONResponse:
+    """Report whether startup pre-warm finished; 503 until every configured model is loaded."""
+    models = manager.readiness()
+    is_ready = all(state == "warm" for state in models.values())
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"status": "ready" if is_ready else "warming", "models": models},
+    )
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
 from app.api.deps import get_job_manager
+from app.api.http_cache import json_response
 from app.schemas.pose import JobInfoResponse
 from app.services.job_manager import JobManager
 
@@ -10,10 +11,11 @@ router = APIRouter(prefix="/jobs", tags=["jobs"])
 @router.get("/{job_id}", response_model=JobInfoResponse)
 def get_job_status(
     job_id: str,
+    request: Request,
     manager: JobManager = Depends(get_job_manager),
-) -> JobInfoResponse:
+) -> Response:
     try:
         job = manager.get_job(job_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="Job not found") from None
-    return manager.job_to_response(job)
+    return json_response(request, manager.job_to_response(job))
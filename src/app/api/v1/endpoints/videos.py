@@ -1,9 +1,9 @@
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
 
 from app.api.deps import get_job_manager
+from app.api.http_cache import file_response, file_version, json_response
 from app.core.config import get_settings
 from app.schemas.pose import (
     LocalProcessRequest,
@@ -13,9 +13,19 @@ from app.schemas.pose import (
     UploadVideoResponse,
 )
 from app.services.job_manager import JobManager
+from app.services.local_sources import SourceChangedError
 
 router = APIRouter(prefix="/videos", tags=["videos"])
 ALLOWED_EXTENSIONS = {".mp4", ".mov"}
+DOWNLOAD_MEDIA_TYPES = {
+    "overlay": "video/mp4",
+    "keypoints": "application/json",
+    "preview_overlay": "video/mp4",
+    "preview_keypoints": "application/json",
+    "profile": "application/octet-stream",
+    "profile_summary": "text/plain",
+}
+COMPRESSIBLE_TYPES = {"keypoints", "preview_keypoints", "profile_summary"}
 settings = get_settings()
 
 
@@ -47,6 +57,8 @@ def start_processing(
         input_path = manager.resolve_uploaded_video(video_id)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Video not found") from None
+    except SourceChangedError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from None
 
     try:
         record = manager.start_job(
@@ -56,6 +68,9 @@ def start_processing(
             every_n_frames=payload.every_n_frames if payload else None,
             output_resolution=payload.output_resolution if payload else None,
             save_intermediate_frames=payload.save_intermediate_frames if payload else None,
+            profile=payload.profile if payload else False,
+            preview=payload.preview if payload else False,
+            encoding=payload.encoding if payload else None,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from None
@@ -82,6 +97,9 @@ def process_local_video(
             every_n_frames=payload.every_n_frames,
             output_resolution=payload.output_resolution,
             save_intermediate_frames=payload.save_intermediate_frames,
+            profile=payload.profile,
+            preview=payload.preview,
+            encoding=payload.encoding,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from None
@@ -91,27 +109,50 @@ def process_local_video(
 @router.get("/{video_id}/results", response_model=ResultsResponse)
 def get_video_results(
     video_id: str,
+    request: Request,
     manager: JobManager = Depends(get_job_manager),
-) -> ResultsResponse:
+) -> Response:
     try:
         files = manager.list_result_files(video_id)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="No output found for this video") from None
-    return ResultsResponse(video_id=video_id, files=files)
+
+    versions: dict[str, str] = {}
+    for file_type, path in files.items():
+        if file_type in DOWNLOAD_MEDIA_TYPES:
+            try:
+                versions[file_type] = file_version(Path(path).stat())
+            except FileNotFoundError:  # replaced between listing and stat
+                continue
+    return json_response(request, ResultsResponse(video_id=video_id, files=files, versions=versions))
 
 
 @router.get("/{video_id}/download")
 def download_video_result(
     video_id: str,
-    type: str = Query(..., pattern="^(overlay|keypoints)$"),
+    request: Request,
+    type: str = Query(
+        ...,
+        pattern="^(overlay|keypoints|preview_overlay|preview_keypoints|profile|profile_summary)$",
+    ),
+    v: str | None = Query(default=None, description="File version from /results; makes the response immutable"),
     manager: JobManager = Depends(get_job_manager),
-) -> FileResponse:
+) -> Response:
     try:
         path = manager.resolve_output_file(video_id, type)
     except ValueError:
-        raise HTTPException(status_code=400, detail="type must be overlay or keypoints") from None
+        raise HTTPException(
+            status_code=400,
+            detail=f"type must be one of: {', '.join(DOWNLOAD_MEDIA_TYPES)}",
+        ) from None
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Requested result file does not exist") from None
 
-    media_type = "application/json" if type == "keypoints" else "video/mp4"
-    return FileResponse(path=path, media_type=media_type, filename=path.name)
+    return file_response(
+        request,
+        path,
+        media_type=DOWNLOAD_MEDIA_TYPES[type],
+        filename=path.name,
+        version=v,
+        compress=type in COMPRESSIBLE_TYPES,
+    )
@@ -18,6 +18,27 @@ class Settings(BaseSettings):
     pose_output_resolution: str = "original"
     pose_save_intermediate_frames: bool = False
     pose_max_video_seconds: int = 180
+    pose_preview_every_n_frames: int = 5
+    # "<width>" keeps the source aspect ratio.
+    pose_preview_resolution: str = "480"
+    # Comma-separated models loaded in the background at startup, e.g. "openpose,mediapipe".
+    pose_prewarm_models: str = ""
+    # How /videos/process-local registers files: "auto" (hardlink/reflink/reference), "reference" or "copy".
+    local_registration_mode: str = "auto"
+    # How referenced files are checked: "stat" (size + mtime) or "hash" (sha256 fallback, hashed in the background).
+    local_verify: str = "stat"
+    # "thread" runs jobs inside the API process; "queue" only enqueues them for `python -m app.worker`.
+    job_backend: str = "thread"
+    # SQLite file shared by API nodes and workers; defaults to <data_root>/jobs.sqlite3.
+    job_queue_path: str = ""
+    job_heartbeat_seconds: float = 10.0
+    # Running jobs without a heartbeat for this long are handed to another worker.
+    job_stale_seconds: float = 60.0
+    job_max_attempts: int = 3
+
+    @property
+    def prewarm_models(self) -> list[str]:
+        return [name.strip() for name in self.pose_prewarm_models.split(",") if name.strip()]
 
     @property
     def uploads_dir(self) -> Path:
@@ -27,6 +48,10 @@ class Settings(BaseSettings):
     def outputs_dir(self) -> Path:
         return Path(self.data_root) / self.outputs_dirname
 
+    @property
+    def job_queue_file(self) -> Path:
+        return Path(self.job_queue_path) if self.job_queue_path else Path(self.data_root) / "jobs.sqlite3"
+
 
 @lru_cache
 def get_settings() -> Settings:
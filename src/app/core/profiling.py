@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+PROFILE_FILENAME = "profile.prof"
+PROFILE_SUMMARY_FILENAME = "profile.txt"
+
+# cProfile uses sys.monitoring on 3.12+, which is interpreter-wide, so
+# profiled jobs take turns instead of corrupting each other's numbers.
+_profile_lock = threading.Lock()
+
+
+def _current_rss() -> int | None:
+    """Resident set size in bytes (Linux only)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _RssSampler:
+    """Tracks the peak RSS on a background thread while a profiled job runs.
+
+    Unlike tracemalloc this adds no per-allocation cost to other jobs, but the
+    figure is for the whole process, including any jobs running alongside.
+    """
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.peak = _current_rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-rss", daemon=True)
+
+    def __enter__(self) -> _RssSampler:
+        if self.peak is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._sample()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        rss = _current_rss()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+
+@contextmanager
+def profile_job(output_dir: Path, top_n: int = 40) -> Iterator[None]:
+    """Run the enclosed block under cProfile, writing results to output_dir.
+
+    Produces a binary pstats file (loadable with snakeviz/pstats) and a text
+    summary with wall time, memory high-water marks and the hottest functions.
+    """
+    with _profile_lock:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        profiler = cProfile.Profile()
+        sampler = _RssSampler()
+        start = time.perf_counter()
+        try:
+            with sampler:
+                profiler.enable()
+                try:
+                    yield
+                finally:
+                    profiler.disable()
+        finally:
+            elapsed = time.perf_counter() - start
+            profiler.dump_stats(str(output_dir / PROFILE_FILENAME))
+            (output_dir / PROFILE_SUMMARY_FILENAME).write_text(
+                _summary(profiler, elapsed, sampler.peak, top_n), encoding="utf-8"
+            )
+
+
+def _summary(profiler: cProfile.Profile, elapsed: float, rss_peak: int | None, top_n: int) -> str:
+    lines = [f"wall_seconds: {elapsed:.3f}"]
+    if rss_peak is not None:
+        lines.append(f"process_rss_peak_during_job_mb: {rss_peak / 1024 / 1024:.2f}")
+    if resource is not None:
+        # ru_maxrss is KiB on Linux; it is the process-lifetime peak, not per job.
+        max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        lines.append(f"process_max_rss_mb: {max_rss_kb / 1024:.2f}")
+    lines.append("memory_note: figures are process-wide and include any jobs that ran concurrently")
+
+    for sort_key in ("cumulative", "tottime"):
+        buffer = io.StringIO()
+        stats = pstats.Stats(profiler, stream=buffer)
+        stats.sort_stats(sort_key).print_stats(top_n)
+        lines.extend(["", f"=== top {top_n} by {sort_key} ===", buffer.getvalue()])
+    return "\n".join(lines)
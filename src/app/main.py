@@ -1,14 +1,31 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.deps import get_job_manager, get_similarity_index
 from app.api.routes import router as root_api_router
 from app.api.v1.endpoints.health import router as health_router
 from app.api.v1.endpoints.jobs import router as jobs_router
+from app.api.v1.endpoints.metrics import router as metrics_router
 from app.api.v1.endpoints.videos import router as videos_router
 from app.core.config import get_settings
 
 settings = get_settings()
-app = FastAPI(title=settings.app_name)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    if settings.prewarm_models:
+        # Warm in the background so the server starts accepting traffic (and /health) at once.
+        get_job_manager().prewarm(settings.prewarm_models)
+    # Build the similarity index now; its initial sync runs on a background thread.
+    get_similarity_index(manager=get_job_manager())
+    yield
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,6 +36,7 @@ app.add_middleware(
 )
 
 app.include_router(health_router)
+app.include_router(metrics_router)
 # Keep root-level routes to match demo contract paths (/videos/*, /jobs/*).
 app.include_router(videos_router)
 app.include_router(jobs_router)
@@ -1,11 +1,16 @@
-from abc import ABC, abstractmethod
+from __future__ import annotations
 
-import numpy as np
-import numpy.typing as npt
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
 from app.schemas.pose import PoseResult
 
-Frame = npt.NDArray[np.uint8]
+if TYPE_CHECKING:
+    # numpy stays out of the import path of the API process; models pull it in when they run.
+    import numpy as np
+    import numpy.typing as npt
+
+    Frame = npt.NDArray[np.uint8]
 
 
 class BasePoseModel(ABC):
@@ -15,6 +20,9 @@ class BasePoseModel(ABC):
     def load_model(self) -> None:
         """Load model weights/resources."""
 
+    def reset(self) -> None:
+        """Forget per-stream state (e.g. tracking) before the next video. Stateless models keep the default."""
+
     @abstractmethod
     def infer(self, frame: Frame) -> PoseResult:
         """Run pose inference on a single frame."""
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-import cv2
-
-from app.models.base_model import BasePoseModel, Frame
+from app.models.base_model import BasePoseModel
 from app.schemas.pose import PoseKeypoint, PoseResult
 
+if TYPE_CHECKING:
+    from app.models.base_model import Frame
+
 
 # A compact skeleton subset for cleaner overlays.
 SKELETON_EDGES = [
@@ -59,10 +61,19 @@ class MediaPipePoseModel(BasePoseModel):
             self._state.pose = None
             self._state.landmarks = None
 
+    def reset(self) -> None:
+        # Pose(static_image_mode=False) tracks from the previous frame's region of
+        # interest, so a fresh graph keeps one video from seeding the next.
+        if self._state.pose is not None:
+            self._state.pose.close()
+            self.load_model()
+
     def infer(self, frame: Frame) -> PoseResult:
         if self._state.pose is None:
             return self._heuristic_pose(frame)
 
+        import cv2
+
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         result = self._state.pose.process(rgb)
         if not result.pose_landmarks:
@@ -95,6 +106,8 @@ class MediaPipePoseModel(BasePoseModel):
         )
 
     def visualize(self, frame: Frame, pose_result: PoseResult) -> Frame:
+        import cv2
+
         rendered = frame.copy()
         if not pose_result.keypoints:
             return rendered
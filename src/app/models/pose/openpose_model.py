@@ -1,7 +1,14 @@
-from app.models.base_model import BasePoseModel, Frame
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from app.models.base_model import BasePoseModel
 from app.models.pose.mediapipe_model import MediaPipePoseModel
 from app.schemas.pose import PoseResult
 
+if TYPE_CHECKING:
+    from app.models.base_model import Frame
+
 
 class OpenPoseModel(BasePoseModel):
     """
@@ -18,6 +25,9 @@ class OpenPoseModel(BasePoseModel):
     def load_model(self) -> None:
         self._fallback.load_model()
 
+    def reset(self) -> None:
+        self._fallback.reset()
+
     def infer(self, frame: Frame) -> PoseResult:
         return self._fallback.infer(frame)
 
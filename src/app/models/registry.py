@@ -1,28 +1,72 @@
+import threading
+import time
 from collections.abc import Callable
 
+from app.core.metrics import MODEL_LOAD_SECONDS
 from app.models.base_model import BasePoseModel
-from app.models.pose.mediapipe_model import MediaPipePoseModel
-from app.models.pose.openpose_model import OpenPoseModel
+
+
+# Model modules import cv2/mediapipe, so they are only imported when a model is built.
+def _openpose() -> BasePoseModel:
+    from app.models.pose.openpose_model import OpenPoseModel
+
+    return OpenPoseModel()
+
+
+def _mediapipe() -> BasePoseModel:
+    from app.models.pose.mediapipe_model import MediaPipePoseModel
+
+    return MediaPipePoseModel()
 
 
 class PoseModelRegistry:
-    def __init__(self) -> None:
+    def __init__(self, max_idle_per_model: int = 4) -> None:
         self._factories: dict[str, Callable[[], BasePoseModel]] = {
-            "openpose": OpenPoseModel,
-            "mediapipe": MediaPipePoseModel,
+            "openpose": _openpose,
+            "mediapipe": _mediapipe,
         }
+        self.max_idle_per_model = max_idle_per_model
+        # Loaded instances not currently used by a job. Models keep per-stream
+        # state, so an instance is only ever handed to one job at a time.
+        self._idle: dict[str, list[BasePoseModel]] = {}
+        self._lock = threading.Lock()
 
     def register(self, name: str, factory: Callable[[], BasePoseModel]) -> None:
-        self._factories[name] = factory
+        key = name.lower()
+        with self._lock:
+            self._factories[key] = factory
+            self._idle.pop(key, None)
 
     def create(self, name: str) -> BasePoseModel:
         key = name.lower()
         if key not in self._factories:
             supported = ", ".join(sorted(self._factories))
             raise ValueError(f"Unsupported pose model '{name}'. Supported: {supported}")
+        start = time.perf_counter()
         model = self._factories[key]()
         model.load_model()
+        MODEL_LOAD_SECONDS.observe(time.perf_counter() - start, model=key)
         return model
 
+    def acquire(self, name: str) -> BasePoseModel:
+        """Return an idle loaded instance if one exists, otherwise load a new one."""
+        key = name.lower()
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+        return self.create(key)
+
+    def release(self, name: str, model: BasePoseModel) -> None:
+        key = name.lower()
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_model:
+                idle.append(model)
+
+    def warm(self, name: str) -> None:
+        """Load one instance ahead of time so the first job does not pay for it."""
+        self.release(name, self.create(name))
+
     def supported_models(self) -> list[str]:
         return sorted(self._factories)
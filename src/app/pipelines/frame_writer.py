@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from app.core.metrics import STAGE_SECONDS
+
+if TYPE_CHECKING:
+    from app.models.base_model import Frame
+
+
+class FrameWriterPool:
+    """Writes JPEG frames on background threads so encoding stays off the inference loop.
+
+    ``submit`` blocks once ``max_pending`` frames are queued, which bounds memory
+    when the disk is slower than inference.
+    """
+
+    def __init__(self, jpeg_quality: int = 90, workers: int = 2, max_pending: int = 32) -> None:
+        self.jpeg_quality = jpeg_quality
+        self.errors: list[str] = []
+        self._queue: queue.Queue[tuple[Path, Frame] | None] = queue.Queue(maxsize=max_pending)
+        self._threads = [
+            threading.Thread(target=self._work, name=f"frame-writer-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, path: Path, frame: Frame) -> None:
+        self._queue.put((path, frame))
+
+    def close(self) -> None:
+        """Flush queued frames and stop the workers. Failures are collected in ``errors``."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> FrameWriterPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _work(self) -> None:
+        import cv2
+
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, frame = item
+            start = time.perf_counter()
+            try:
+                if not cv2.imwrite(str(path), frame, params):
+                    self.errors.append(f"Failed to write frame {path}")
+            except Exception as exc:  # pragma: no cover - disk/codec failure
+                self.errors.append(f"Failed to write frame {path}: {exc}")
+            STAGE_SECONDS.observe(time.perf_counter() - start, stage="imwrite")
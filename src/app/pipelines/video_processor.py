@@ -1,17 +1,33 @@
 from __future__ import annotations
 
+import os
+import threading
+import uuid
 from pathlib import Path
 
-import cv2
-
+from app.core.metrics import StageTimer
+from app.models.base_model import BasePoseModel
 from app.models.registry import PoseModelRegistry
+from app.pipelines.frame_writer import FrameWriterPool
 from app.schemas.pose import FramePoseRecord, KeypointsPayload, PoseResult, ProcessingConfig
 
 
+class JobCancelledError(RuntimeError):
+    """Raised when a job's cancel event is set while it is processing frames."""
+
+
 class VideoProcessor:
-    def __init__(self, registry: PoseModelRegistry, max_video_seconds: int) -> None:
+    def __init__(
+        self,
+        registry: PoseModelRegistry,
+        max_video_seconds: int,
+        frame_writer_workers: int = 2,
+        frame_writer_max_pending: int = 32,
+    ) -> None:
         self.registry = registry
         self.max_video_seconds = max_video_seconds
+        self.frame_writer_workers = frame_writer_workers
+        self.frame_writer_max_pending = frame_writer_max_pending
 
     def process_video(
         self,
@@ -19,17 +35,57 @@ class VideoProcessor:
         input_path: Path,
         output_dir: Path,
         config: ProcessingConfig,
+        model: BasePoseModel | None = None,
+        timer: StageTimer | None = None,
+        artifact_prefix: str = "",
+        cancel: threading.Event | None = None,
     ) -> dict[str, str]:
+        """Run pose inference over a video and write keypoints, overlay and optional frames.
+
+        Artifacts are written under temporary names and renamed into place when
+        complete, so readers never see a half-written file. ``artifact_prefix``
+        namespaces the keypoints/overlay files (and their output keys), e.g. "preview_".
+        Setting ``cancel`` stops the run at the next frame with JobCancelledError,
+        leaving no artifacts behind.
+        """
+        timer = timer or StageTimer()
+        if model is None:
+            with timer.stage("model_load"):
+                model = self.registry.acquire(config.model)
+            try:
+                return self.process_video(
+                    video_id,
+                    input_path,
+                    output_dir,
+                    config,
+                    model=model,
+                    timer=timer,
+                    artifact_prefix=artifact_prefix,
+                    cancel=cancel,
+                )
+            finally:
+                self.registry.release(config.model, model)
+
+        import cv2
+
+        # Pooled instances move between videos (and between a preview and its full render).
+        with timer.stage("model_load"):
+            model.reset()
+
         output_dir.mkdir(parents=True, exist_ok=True)
-        keypoints_path = output_dir / "keypoints.json"
-        overlay_path = output_dir / "overlay.mp4"
+        keypoints_path = output_dir / f"{artifact_prefix}keypoints.json"
+        overlay_path = output_dir / f"{artifact_prefix}overlay.mp4"
+        # Unique per run so overlapping runs never rename each other's files; keep the
+        # real extension last so OpenCV still picks the container from it.
+        token = uuid.uuid4().hex[:8]
+        overlay_partial = output_dir / f".{artifact_prefix}overlay.{token}.partial.mp4"
+        keypoints_partial = output_dir / f".{artifact_prefix}keypoints.{token}.partial.json"
         frames_dir = output_dir / "frames"
         if config.save_intermediate_frames:
             frames_dir.mkdir(parents=True, exist_ok=True)
 
-        model = self.registry.create(config.model)
-
-        capture = cv2.VideoCapture(str(input_path))
+        with timer.stage("open"):
+            capture = cv2.VideoCapture(str(input_path))
         if not capture.isOpened():
             raise RuntimeError(f"Failed to open video: {input_path}")
 
@@ -49,31 +105,49 @@ class VideoProcessor:
         src_h = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
         out_w, out_h = self._resolve_output_resolution(config.output_resolution, src_w, src_h)
 
+        encoding = config.encoding
+        overlay_fps = fps / encoding.output_frame_stride
         writer = cv2.VideoWriter(
-            str(overlay_path),
-            cv2.VideoWriter_fourcc(*"mp4v"),
-            fps,
+            str(overlay_partial),
+            cv2.VideoWriter_fourcc(*encoding.output_codec),
+            overlay_fps,
             (out_w, out_h),
         )
         if not writer.isOpened():
             capture.release()
-            raise RuntimeError("Failed to initialize output overlay video writer")
+            raise RuntimeError(f"Failed to initialize output overlay video writer ({encoding.output_codec})")
+        if encoding.output_quality is not None:
+            # Honoured by backends with a quality knob (e.g. MJPG); ignored elsewhere.
+            writer.set(cv2.VIDEOWRITER_PROP_QUALITY, encoding.output_quality)
+
+        frame_writer: FrameWriterPool | None = None
+        if config.save_intermediate_frames:
+            frame_writer = FrameWriterPool(
+                jpeg_quality=encoding.frame_jpeg_quality,
+                workers=self.frame_writer_workers,
+                max_pending=self.frame_writer_max_pending,
+            )
 
         frames: list[FramePoseRecord] = []
         frame_index = 0
 
         try:
             while True:
-                ok, frame = capture.read()
+                if cancel is not None and cancel.is_set():
+                    raise JobCancelledError(f"Processing of {video_id} was cancelled")
+                with timer.stage("decode"):
+                    ok, frame = capture.read()
                 if not ok:
                     break
 
                 if (out_w, out_h) != (src_w, src_h):
-                    frame = cv2.resize(frame, (out_w, out_h), interpolation=cv2.INTER_LINEAR)
+                    with timer.stage("resize"):
+                        frame = cv2.resize(frame, (out_w, out_h), interpolation=cv2.INTER_LINEAR)
 
                 pose_result: PoseResult
                 if frame_index % config.every_n_frames == 0:
-                    pose_result = model.infer(frame)
+                    with timer.stage("infer"):
+                        pose_result = model.infer(frame)
                 else:
                     pose_result = PoseResult()
 
@@ -86,16 +160,35 @@ class VideoProcessor:
                     )
                 )
 
-                rendered = model.visualize(frame, pose_result)
-                writer.write(rendered)
-
-                if config.save_intermediate_frames:
-                    cv2.imwrite(str(frames_dir / f"{frame_index:06d}.jpg"), rendered)
+                write_overlay = frame_index % encoding.output_frame_stride == 0
+                dump_frame = frame_writer is not None and frame_index % encoding.frame_stride == 0
+                if write_overlay or dump_frame:
+                    with timer.stage("visualize"):
+                        rendered = model.visualize(frame, pose_result)
+                    if write_overlay:
+                        with timer.stage("encode"):
+                            writer.write(rendered)
+                    if dump_frame:
+                        # Time spent here is back-pressure from a full writer queue.
+                        with timer.stage("frame_enqueue"):
+                            frame_writer.submit(frames_dir / f"{frame_index:06d}.jpg", rendered)
 
                 frame_index += 1
+                timer.frames = frame_index
+        except BaseException:
+            overlay_partial.unlink(missing_ok=True)
+            raise
         finally:
             capture.release()
             writer.release()
+            if frame_writer is not None:
+                with timer.stage("frame_flush"):
+                    frame_writer.close()
+
+        if frame_writer is not None and frame_writer.errors:
+            overlay_partial.unlink(missing_ok=True)
+            raise RuntimeError(frame_writer.errors[0])
+        os.replace(overlay_partial, overlay_path)
 
         payload = KeypointsPayload(
             video_id=video_id,
@@ -106,14 +199,18 @@ class VideoProcessor:
                 "total_frames": frame_index,
                 "output_resolution": f"{out_w}x{out_h}",
                 "every_n_frames": config.every_n_frames,
+                "overlay_fps": overlay_fps,
+                "output_codec": encoding.output_codec,
             },
         )
 
-        keypoints_path.write_text(payload.model_dump_json(indent=2), encoding="utf-8")
+        with timer.stage("serialize"):
+            keypoints_partial.write_text(payload.model_dump_json(indent=2), encoding="utf-8")
+            os.replace(keypoints_partial, keypoints_path)
 
         outputs = {
-            "keypoints": str(keypoints_path),
-            "overlay": str(overlay_path),
+            f"{artifact_prefix}keypoints": str(keypoints_path),
+            f"{artifact_prefix}overlay": str(overlay_path),
         }
         if config.save_intermediate_frames:
             outputs["frames_dir"] = str(frames_dir)
@@ -124,13 +221,25 @@ class VideoProcessor:
         if output_resolution.lower() == "original":
             return src_w, src_h
 
+        width_only = "x" not in output_resolution.lower()
         try:
-            width_str, height_str = output_resolution.lower().split("x", maxsplit=1)
-            width = int(width_str)
-            height = int(height_str)
+            if width_only:
+                width = int(output_resolution)
+                height = 0
+            else:
+                width_str, height_str = output_resolution.lower().split("x", maxsplit=1)
+                width = int(width_str)
+                height = int(height_str)
         except Exception as exc:  # pragma: no cover - defensive input validation
-            raise ValueError("output_resolution must be 'original' or '<width>x<height>'") from exc
+            raise ValueError(
+                "output_resolution must be 'original', '<width>' or '<width>x<height>'"
+            ) from exc
 
-        if width <= 0 or height <= 0:
+        if width <= 0 or (height <= 0 and not width_only):
             raise ValueError("output_resolution width/height must be positive")
+        if width_only:
+            # Keep the source aspect ratio, never upscale, and keep dimensions even for codecs.
+            width = min(width, src_w)
+            width = max(2, width - width % 2)
+            height = max(2, round(src_h * width / max(1, src_w) / 2) * 2)
         return width, height
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -12,3 +14,40 @@ class AnalyzeResponse(BaseModel):
     grade_estimate: str
     confidence: float
     notes: list[str]
+
+
+class JointMotionStats(BaseModel):
+    # Speeds/accelerations are in torso lengths per second (squared), so they are camera-distance invariant.
+    mean_speed: float
+    max_speed: float
+    mean_acceleration: float
+    max_acceleration: float
+
+
+class DistanceStats(BaseModel):
+    mean: float
+    min: float
+    max: float
+
+
+class MovementSegment(BaseModel):
+    kind: Literal["static", "dynamic"]
+    start_s: float
+    end_s: float
+
+
+class ClimbMetricsResponse(BaseModel):
+    video_id: str
+    model: str
+    fps: float
+    total_frames: int
+    detected_frames: int
+    detection_ratio: float
+    time_on_wall_s: float
+    torso_length_px: float
+    joints: dict[str, JointMotionStats] = Field(default_factory=dict)
+    center_of_mass: list[list[float]] = Field(default_factory=list)
+    hip_to_wall_distance: DistanceStats | None = None
+    segments: list[MovementSegment] = Field(default_factory=list)
+    static_time_s: float = 0.0
+    dynamic_time_s: float = 0.0
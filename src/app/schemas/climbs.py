@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+
+
+class SimilarClimb(BaseModel):
+    video_id: str
+    distance: float
+
+
+class SimilarClimbsResponse(BaseModel):
+    video_id: str
+    results: list[SimilarClimb] = Field(default_factory=list)
+    candidates: int = 0
+    dtw_evaluations: int = 0
@@ -31,11 +31,22 @@ class FramePoseRecord(BaseModel):
     bbox: list[float] | None = None
 
 
+class EncodingOptions(BaseModel):
+    output_codec: str = Field(default="mp4v", pattern=r"^[A-Za-z0-9 ]{4}$")
+    output_quality: int | None = Field(default=None, ge=1, le=100)
+    output_frame_stride: int = Field(default=1, ge=1)
+    frame_jpeg_quality: int = Field(default=90, ge=1, le=100)
+    frame_stride: int = Field(default=1, ge=1)
+
+
 class ProcessingConfig(BaseModel):
     model: str = "openpose"
     every_n_frames: int = Field(default=1, ge=1)
     output_resolution: str = Field(default="original")
     save_intermediate_frames: bool = False
+    profile: bool = False
+    preview: bool = False
+    encoding: EncodingOptions = Field(default_factory=EncodingOptions)
 
 
 class UploadVideoResponse(BaseModel):
@@ -47,6 +58,9 @@ class StartProcessRequest(BaseModel):
     every_n_frames: int | None = Field(default=None, ge=1)
     output_resolution: str | None = Field(default=None)
     save_intermediate_frames: bool | None = None
+    profile: bool = False
+    preview: bool = False
+    encoding: EncodingOptions | None = None
 
 
 class StartProcessResponse(BaseModel):
@@ -62,11 +76,15 @@ class JobInfoResponse(BaseModel):
     status: JobStatus
     error: str | None = None
     outputs: dict[str, str] = Field(default_factory=dict)
+    timings: dict[str, float] = Field(default_factory=dict)
+    frames_per_second: float | None = None
 
 
 class ResultsResponse(BaseModel):
     video_id: str
     files: dict[str, str]
+    # Pass as ``v`` on downloads to get an immutable, long-cacheable response.
+    versions: dict[str, str] = Field(default_factory=dict)
 
 
 class LocalProcessRequest(BaseModel):
@@ -75,6 +93,31 @@ class LocalProcessRequest(BaseModel):
     every_n_frames: int | None = Field(default=None, ge=1)
     output_resolution: str | None = Field(default=None)
     save_intermediate_frames: bool | None = None
+    profile: bool = False
+    preview: bool = False
+    encoding: EncodingOptions | None = None
+
+
+class BatchItem(StartProcessRequest):
+    video_id: str
+    model: str = "openpose"
+
+
+class BatchProcessRequest(BaseModel):
+    items: list[BatchItem] = Field(min_length=1)
+
+
+class BatchProcessResponse(BaseModel):
+    batch_id: str
+    jobs: list[StartProcessResponse]
+
+
+class BatchStatusResponse(BaseModel):
+    batch_id: str
+    status: JobStatus
+    total: int
+    counts: dict[JobStatus, int] = Field(default_factory=dict)
+    jobs: list[JobInfoResponse] = Field(default_factory=list)
 
 
 class KeypointsPayload(BaseModel):
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import threading
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from app.schemas.analysis import (
+    ClimbMetricsResponse,
+    DistanceStats,
+    JointMotionStats,
+    MovementSegment,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+# MediaPipe landmark ids tracked for climbing metrics (keypoint names are the ids as strings).
+JOINTS: dict[str, str] = {
+    "11": "left_shoulder",
+    "12": "right_shoulder",
+    "13": "left_elbow",
+    "14": "right_elbow",
+    "15": "left_wrist",
+    "16": "right_wrist",
+    "23": "left_hip",
+    "24": "right_hip",
+    "25": "left_knee",
+    "26": "right_knee",
+    "27": "left_ankle",
+    "28": "right_ankle",
+}
+JOINT_IDS = list(JOINTS)
+_J = {joint_id: i for i, joint_id in enumerate(JOINT_IDS)}
+SHOULDERS = [_J["11"], _J["12"]]
+HIPS = [_J["23"], _J["24"]]
+CONTACTS = [_J["15"], _J["16"], _J["27"], _J["28"]]
+
+
+@dataclass
+class KeypointSeries:
+    video_id: str
+    model: str
+    fps: float
+    every_n_frames: int
+    frame_index: npt.NDArray[np.int64]  # (T,)
+    xy: npt.NDArray[np.float64]  # (T, J, 2), NaN where a joint was not detected
+
+
+def load_keypoint_series(path: Path, min_confidence: float = 0.2) -> KeypointSeries:
+    """Parse a keypoints.json payload into dense arrays over JOINTS."""
+    import numpy as np
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    frames = data["frames"]
+    meta = data.get("meta", {})
+
+    rows: list[int] = []
+    cols: list[int] = []
+    coords: list[tuple[float, float]] = []
+    for t, frame in enumerate(frames):
+        for kp in frame["keypoints"]:
+            j = _J.get(kp["name"])
+            if j is not None and kp["confidence"] >= min_confidence:
+                rows.append(t)
+                cols.append(j)
+                coords.append((kp["x"], kp["y"]))
+
+    xy = np.full((len(frames), len(JOINT_IDS), 2), np.nan)
+    if rows:
+        xy[rows, cols] = coords
+    return KeypointSeries(
+        video_id=data["video_id"],
+        model=data["model"],
+        fps=float(meta.get("fps") or 30.0),
+        every_n_frames=int(meta.get("every_n_frames") or 1),
+        frame_index=np.array([frame["frame_index"] for frame in frames], dtype=np.int64),
+        xy=xy,
+    )
+
+
+def _fill_gaps(t: npt.NDArray[np.float64], xy: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """Linearly interpolate each joint coordinate over time; never-seen joints stay NaN."""
+    import numpy as np
+
+    filled = xy.copy()
+    flat = filled.reshape(len(t), -1)
+    for col in range(flat.shape[1]):
+        seen = ~np.isnan(flat[:, col])
+        if seen.any() and not seen.all():
+            flat[:, col] = np.interp(t, t[seen], flat[seen, col])
+    return filled
+
+
+def _segments(t: npt.NDArray[np.float64], dynamic: npt.NDArray[np.bool_]) -> list[MovementSegment]:
+    import numpy as np
+
+    if t.size == 0:
+        return []
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(dynamic.astype(np.int8))) + 1, [t.size]))
+    segments = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        end_t = t[stop] if stop < t.size else t[-1]
+        segments.append(
+            MovementSegment(
+                kind="dynamic" if dynamic[start] else "static",
+                start_s=float(t[start]),
+                end_s=float(end_t),
+            )
+        )
+    return segments
+
+
+def compute_metrics(series: KeypointSeries, dynamic_threshold: float = 0.5) -> ClimbMetricsResponse:
+    """Compute motion metrics from a keypoint series.
+
+    Lengths are normalised by the median shoulder-to-hip (torso) length. The
+    centre of mass is approximated as 60% hip midpoint + 40% shoulder midpoint.
+    Hip-to-wall distance is a 2D proxy: the horizontal offset of the hip
+    midpoint from the centroid of the hand/foot contact points, which lie on the
+    wall. Frames whose centre of mass moves faster than ``dynamic_threshold``
+    torso lengths per second are classed as dynamic.
+    """
+    import numpy as np
+
+    total_frames = int(series.frame_index.size)
+    detected = ~np.isnan(series.xy).all(axis=(1, 2))
+    sampled_frames = max(1, -(-total_frames // series.every_n_frames))
+
+    t = series.frame_index[detected] / series.fps
+    base = ClimbMetricsResponse(
+        video_id=series.video_id,
+        model=series.model,
+        fps=series.fps,
+        total_frames=total_frames,
+        detected_frames=int(detected.sum()),
+        detection_ratio=min(1.0, float(detected.sum()) / sampled_frames),
+        time_on_wall_s=float(t[-1] - t[0] + 1.0 / series.fps) if t.size else 0.0,
+        torso_length_px=0.0,
+    )
+    if t.size < 2:
+        return base
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)  # all-NaN slices are expected
+        xy = _fill_gaps(t, series.xy[detected])  # (N, J, 2)
+        shoulder_mid = np.nanmean(xy[:, SHOULDERS], axis=1)  # (N, 2)
+        hip_mid = np.nanmean(xy[:, HIPS], axis=1)
+        torso = float(np.nanmedian(np.linalg.norm(shoulder_mid - hip_mid, axis=1)))
+        if not np.isfinite(torso) or torso <= 0:
+            torso = 1.0
+
+        velocity = np.gradient(xy, t, axis=0)  # (N, J, 2)
+        acceleration = np.gradient(velocity, t, axis=0)
+        speed = np.linalg.norm(velocity, axis=2) / torso  # (N, J)
+        accel = np.linalg.norm(acceleration, axis=2) / torso
+
+        joints: dict[str, JointMotionStats] = {}
+        seen = ~np.isnan(speed).all(axis=0)
+        for j in np.flatnonzero(seen):
+            joints[JOINTS[JOINT_IDS[j]]] = JointMotionStats(
+                mean_speed=float(np.nanmean(speed[:, j])),
+                max_speed=float(np.nanmax(speed[:, j])),
+                mean_acceleration=float(np.nanmean(accel[:, j])),
+                max_acceleration=float(np.nanmax(accel[:, j])),
+            )
+
+        com = np.where(np.isnan(shoulder_mid), hip_mid, 0.6 * hip_mid + 0.4 * shoulder_mid)
+        com = np.where(np.isnan(com), shoulder_mid, com)
+        com_speed = np.linalg.norm(np.gradient(com, t, axis=0), axis=1) / torso
+        dynamic = np.nan_to_num(com_speed) > dynamic_threshold
+
+        contact_x = np.nanmean(xy[:, CONTACTS, 0], axis=1)
+        hip_to_wall = np.abs(hip_mid[:, 0] - contact_x) / torso
+        hip_to_wall = hip_to_wall[np.isfinite(hip_to_wall)]
+
+    dt = np.diff(t, append=t[-1] + 1.0 / series.fps)
+    com_valid = np.isfinite(com).all(axis=1)
+    return base.model_copy(
+        update={
+            "torso_length_px": torso,
+            "joints": joints,
+            "center_of_mass": np.column_stack((t[com_valid], com[com_valid])).round(3).tolist(),
+            "hip_to_wall_distance": (
+                DistanceStats(
+                    mean=float(hip_to_wall.mean()),
+                    min=float(hip_to_wall.min()),
+                    max=float(hip_to_wall.max()),
+                )
+                if hip_to_wall.size
+                else None
+            ),
+            "segments": _segments(t, dynamic),
+            "static_time_s": float(dt[~dynamic].sum()),
+            "dynamic_time_s": float(dt[dynamic].sum()),
+        }
+    )
+
+
+class ClimbMetricsService:
+    """Computes climb metrics from processed keypoints, cached per (video, model) and file version."""
+
+    def __init__(self, outputs_dir: Path, max_entries: int = 256) -> None:
+        self.outputs_dir = outputs_dir
+        self.max_entries = max_entries
+        self._cache: OrderedDict[tuple[str, str], tuple[tuple[int, int], ClimbMetricsResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def analyze_video(self, video_id: str, model: str | None = None) -> ClimbMetricsResponse:
+        """Raises FileNotFoundError if the video has no keypoints (for ``model``, when given)."""
+        path = self.outputs_dir / video_id / "keypoints.json"
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No keypoints found for video '{video_id}'") from None
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        key = (video_id, (model or "").lower())
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] == version:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        series = load_keypoint_series(path)
+        if model and series.model.lower() != model.lower():
+            raise FileNotFoundError(f"Keypoints for video '{video_id}' were produced by '{series.model}'")
+        result = compute_metrics(series)
+
+        with self._lock:
+            self._cache[key] = (version, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return result
@@ -2,13 +2,38 @@ from __future__ import annotations
 
 import shutil
 import threading
+import time
 import uuid
+from collections.abc import Callable
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+from app.core.metrics import (
+    JOB_FRAMES_PER_SECOND,
+    JOB_SECONDS,
+    JOBS_QUEUED,
+    JOBS_RUNNING,
+    JOBS_TOTAL,
+    StageTimer,
+)
+from app.core.profiling import PROFILE_FILENAME, PROFILE_SUMMARY_FILENAME, profile_job
+from app.models.base_model import BasePoseModel
 from app.models.registry import PoseModelRegistry
 from app.pipelines.video_processor import VideoProcessor
-from app.schemas.pose import JobStatus, JobInfoResponse, ProcessingConfig
+from app.services import local_sources
+from app.schemas.pose import (
+    BatchItem,
+    BatchStatusResponse,
+    EncodingOptions,
+    JobStatus,
+    JobInfoResponse,
+    ProcessingConfig,
+)
+
+if TYPE_CHECKING:
+    from app.services.job_queue import SQLiteJobQueue
 
 
 @dataclass
@@ -19,6 +44,14 @@ class JobRecord:
     status: JobStatus = JobStatus.pending
     error: str | None = None
     outputs: dict[str, str] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+    frames_per_second: float | None = None
+
+
+@dataclass
+class BatchRecord:
+    batch_id: str
+    job_ids: list[str] = field(default_factory=list)
 
 
 class JobManager:
@@ -30,13 +63,29 @@ class JobManager:
         default_output_resolution: str,
         default_save_intermediate_frames: bool,
         max_video_seconds: int,
+        local_registration_mode: str = "auto",
+        local_verify: str = "stat",
+        preview_every_n_frames: int = 5,
+        preview_resolution: str = "480",
+        job_queue: SQLiteJobQueue | None = None,
     ) -> None:
+        """With ``job_queue`` set, jobs are enqueued for ``app.worker`` processes instead of run here."""
+        if local_registration_mode not in local_sources.REGISTRATION_MODES:
+            raise ValueError(f"Unknown local registration mode '{local_registration_mode}'")
+        if local_verify not in local_sources.VERIFY_MODES:
+            raise ValueError(f"Unknown local verify mode '{local_verify}'")
+
         self.uploads_dir = uploads_dir
         self.outputs_dir = outputs_dir
         self.default_every_n_frames = default_every_n_frames
         self.default_output_resolution = default_output_resolution
         self.default_save_intermediate_frames = default_save_intermediate_frames
         self.max_video_seconds = max_video_seconds
+        self.local_registration_mode = local_registration_mode
+        self.local_verify = local_verify
+        self.preview_every_n_frames = preview_every_n_frames
+        self.preview_resolution = preview_resolution
+        self.job_queue = job_queue
 
         self.uploads_dir.mkdir(parents=True, exist_ok=True)
         self.outputs_dir.mkdir(parents=True, exist_ok=True)
@@ -44,8 +93,35 @@ class JobManager:
         self._registry = PoseModelRegistry()
         self._processor = VideoProcessor(registry=self._registry, max_video_seconds=max_video_seconds)
         self._jobs: dict[str, JobRecord] = {}
+        self._batches: dict[str, BatchRecord] = {}
+        self._warm_state: dict[str, str] = {}
+        self._completion_listeners: list[Callable[[JobRecord], None]] = []
+        # Outputs live in outputs_dir/<video_id>, so jobs for the same video take turns.
+        self._video_locks: dict[str, threading.Lock] = {}
         self._lock = threading.Lock()
 
+    @property
+    def registry(self) -> PoseModelRegistry:
+        return self._registry
+
+    def add_completion_listener(self, listener: Callable[[JobRecord], None]) -> None:
+        """Call ``listener`` on the job thread after each job completes successfully."""
+        with self._lock:
+            self._completion_listeners.append(listener)
+
+    def prewarm(self, models: list[str]) -> None:
+        """Load the given models on a background thread; progress is reported by readiness()."""
+        with self._lock:
+            for name in models:
+                self._warm_state[name.lower()] = "warming"
+
+        thread = threading.Thread(target=self._prewarm, args=(models,), daemon=True)
+        thread.start()
+
+    def readiness(self) -> dict[str, str]:
+        with self._lock:
+            return dict(self._warm_state)
+
     def save_upload(self, filename: str, data: bytes) -> tuple[str, Path]:
         ext = Path(filename).suffix.lower()
         video_id = uuid.uuid4().hex[:12]
@@ -54,17 +130,45 @@ class JobManager:
         return video_id, dst
 
     def register_local_video(self, local_path: Path) -> tuple[str, Path]:
+        """Make a local file addressable by video id without copying it on the request thread.
+
+        "auto" tries a hardlink, then a reflink, and otherwise references the file in
+        place. "copy" references the file while a background thread copies it into
+        uploads_dir. Returns the video id and the path the job should read.
+        """
         ext = local_path.suffix.lower()
         video_id = uuid.uuid4().hex[:12]
         dst = self.uploads_dir / f"{video_id}{ext}"
-        shutil.copy2(local_path, dst)
-        return video_id, dst
+
+        if self.local_registration_mode == "auto":
+            if local_sources.hardlink(local_path, dst) or local_sources.reflink(local_path, dst):
+                return video_id, dst
+
+        reference = self.uploads_dir / f"{video_id}{local_sources.REFERENCE_SUFFIX}"
+        local_sources.write_reference(reference, local_path)
+        if self.local_verify == "hash":
+            threading.Thread(target=local_sources.record_hash, args=(reference,), daemon=True).start()
+        if self.local_registration_mode == "copy":
+            thread = threading.Thread(
+                target=local_sources.copy_into_place,
+                args=(local_path, dst, reference),
+                daemon=True,
+            )
+            thread.start()
+        return video_id, local_path
 
     def resolve_uploaded_video(self, video_id: str) -> Path:
+        """Raises FileNotFoundError if unknown and SourceChangedError if a referenced source changed.
+
+        Only stat checks run here; content hashes are compared on the job thread.
+        """
         matches = sorted(self.uploads_dir.glob(f"{video_id}.*"))
-        if not matches:
-            raise FileNotFoundError(f"Video '{video_id}' not found")
-        return matches[0]
+        files = [path for path in matches if not path.name.endswith(local_sources.REFERENCE_SUFFIX)]
+        if files:
+            return files[0]
+        if matches:
+            return local_sources.resolve_reference(matches[0], verify_content=False)
+        raise FileNotFoundError(f"Video '{video_id}' not found")
 
     def start_job(
         self,
@@ -74,54 +178,137 @@ class JobManager:
         every_n_frames: int | None = None,
         output_resolution: str | None = None,
         save_intermediate_frames: bool | None = None,
+        profile: bool = False,
+        preview: bool = False,
+        encoding: EncodingOptions | None = None,
     ) -> JobRecord:
-        if model.lower() not in self._registry.supported_models():
-            supported = ", ".join(self._registry.supported_models())
-            raise ValueError(f"Unsupported model '{model}'. Supported: {supported}")
+        self._validate_model(model)
 
-        job_id = uuid.uuid4().hex
-        record = JobRecord(job_id=job_id, video_id=video_id, model=model)
-
-        with self._lock:
-            self._jobs[job_id] = record
-
-        config = ProcessingConfig(
+        config = self._build_config(
             model=model,
-            every_n_frames=every_n_frames or self.default_every_n_frames,
-            output_resolution=output_resolution or self.default_output_resolution,
-            save_intermediate_frames=(
-                self.default_save_intermediate_frames
-                if save_intermediate_frames is None
-                else save_intermediate_frames
-            ),
+            every_n_frames=every_n_frames,
+            output_resolution=output_resolution,
+            save_intermediate_frames=save_intermediate_frames,
+            profile=profile,
+            preview=preview,
+            encoding=encoding,
         )
+        if self.job_queue is not None:
+            record = JobRecord(job_id=uuid.uuid4().hex, video_id=video_id, model=model)
+            self.job_queue.enqueue(record.job_id, video_id, model, input_path, config)
+            return record
 
+        record = self._create_record(video_id=video_id, model=model)
         thread = threading.Thread(
             target=self._run_job,
-            args=(job_id, video_id, input_path, config),
+            args=(record.job_id, video_id, input_path, config),
             daemon=True,
         )
         thread.start()
         return record
 
+    def start_batch(self, items: list[BatchItem]) -> tuple[BatchRecord, list[JobRecord]]:
+        """Start many jobs at once; items sharing a model run sequentially on one loaded model.
+
+        All items are validated before any job is created, so one bad entry rejects the batch.
+        Raises ValueError for an unsupported model and the errors of resolve_uploaded_video.
+        """
+        resolved: list[tuple[BatchItem, Path]] = []
+        for item in items:
+            self._validate_model(item.model)
+            resolved.append((item, self.resolve_uploaded_video(item.video_id)))
+
+        batch = BatchRecord(batch_id=uuid.uuid4().hex)
+        records: list[JobRecord] = []
+        groups: dict[str, list[tuple[str, str, Path, ProcessingConfig]]] = {}
+        for item, input_path in resolved:
+            config = self._build_config(
+                model=item.model,
+                every_n_frames=item.every_n_frames,
+                output_resolution=item.output_resolution,
+                save_intermediate_frames=item.save_intermediate_frames,
+                profile=item.profile,
+                preview=item.preview,
+                encoding=item.encoding,
+            )
+            if self.job_queue is not None:
+                record = JobRecord(job_id=uuid.uuid4().hex, video_id=item.video_id, model=item.model)
+                self.job_queue.enqueue(
+                    record.job_id, item.video_id, item.model, input_path, config, batch_id=batch.batch_id
+                )
+            else:
+                record = self._create_record(video_id=item.video_id, model=item.model)
+                groups.setdefault(item.model.lower(), []).append(
+                    (record.job_id, item.video_id, input_path, config)
+                )
+            records.append(record)
+            batch.job_ids.append(record.job_id)
+
+        if self.job_queue is not None:
+            return batch, records
+
+        with self._lock:
+            self._batches[batch.batch_id] = batch
+
+        for model_name, jobs in groups.items():
+            thread = threading.Thread(
+                target=self._run_group,
+                args=(model_name, jobs),
+                daemon=True,
+            )
+            thread.start()
+        return batch, records
+
+    def run_job(
+        self,
+        record: JobRecord,
+        input_path: Path,
+        config: ProcessingConfig,
+        cancel: threading.Event | None = None,
+    ) -> None:
+        """Run a job to completion on the calling thread, as queue workers do.
+
+        ``record`` is updated in place while the job runs, so callers can watch
+        its status and any preview outputs published before the full render.
+        Setting ``cancel`` stops the job at the next frame and marks it failed.
+        """
+        with self._lock:
+            self._jobs[record.job_id] = record
+        JOBS_QUEUED.inc()
+        try:
+            self._run_job(record.job_id, record.video_id, input_path, config, cancel=cancel)
+        finally:
+            with self._lock:
+                self._jobs.pop(record.job_id, None)
+
     def get_job(self, job_id: str) -> JobRecord:
+        if self.job_queue is not None:
+            return self.job_queue.get(job_id)
         with self._lock:
             if job_id not in self._jobs:
                 raise KeyError(job_id)
             return self._jobs[job_id]
 
+    def get_batch(self, batch_id: str) -> BatchRecord:
+        if self.job_queue is not None:
+            jobs = self.job_queue.batch_jobs(batch_id)
+            if not jobs:
+                raise KeyError(batch_id)
+            return BatchRecord(batch_id=batch_id, job_ids=[job.job_id for job in jobs])
+        with self._lock:
+            if batch_id not in self._batches:
+                raise KeyError(batch_id)
+            return self._batches[batch_id]
+
     def list_result_files(self, video_id: str) -> dict[str, str]:
         out = self.outputs_dir / video_id
         if not out.exists():
             raise FileNotFoundError(video_id)
 
         files: dict[str, str] = {}
-        keypoints = out / "keypoints.json"
-        overlay = out / "overlay.mp4"
-        if keypoints.exists():
-            files["keypoints"] = str(keypoints)
-        if overlay.exists():
-            files["overlay"] = str(overlay)
+        for file_type, path in self._output_candidates(out).items():
+            if path.exists():
+                files[file_type] = str(path)
 
         frames_dir = out / "frames"
         if frames_dir.exists():
@@ -129,11 +316,7 @@ class JobManager:
         return files
 
     def resolve_output_file(self, video_id: str, file_type: str) -> Path:
-        out = self.outputs_dir / video_id
-        candidates = {
-            "overlay": out / "overlay.mp4",
-            "keypoints": out / "keypoints.json",
-        }
+        candidates = self._output_candidates(self.outputs_dir / video_id)
         if file_type not in candidates:
             raise ValueError(file_type)
         path = candidates[file_type]
@@ -149,26 +332,253 @@ class JobManager:
             status=job.status,
             error=job.error,
             outputs=job.outputs,
+            timings=job.timings,
+            frames_per_second=job.frames_per_second,
+        )
+
+    def batch_to_response(self, batch: BatchRecord) -> BatchStatusResponse:
+        if self.job_queue is not None:
+            jobs = self.job_queue.batch_jobs(batch.batch_id)
+        else:
+            with self._lock:
+                jobs = [self._jobs[job_id] for job_id in batch.job_ids]
+        counts = {status: 0 for status in JobStatus}
+        for job in jobs:
+            counts[job.status] += 1
+
+        finished = counts[JobStatus.completed] + counts[JobStatus.failed]
+        if finished == len(jobs):
+            status = JobStatus.failed if counts[JobStatus.failed] else JobStatus.completed
+        elif counts[JobStatus.pending] == len(jobs):
+            status = JobStatus.pending
+        else:
+            status = JobStatus.running
+
+        return BatchStatusResponse(
+            batch_id=batch.batch_id,
+            status=status,
+            total=len(jobs),
+            counts=counts,
+            jobs=[self.job_to_response(job) for job in jobs],
         )
 
-    def _run_job(self, job_id: str, video_id: str, input_path: Path, config: ProcessingConfig) -> None:
+    @staticmethod
+    def _output_candidates(out: Path) -> dict[str, Path]:
+        return {
+            "keypoints": out / "keypoints.json",
+            "overlay": out / "overlay.mp4",
+            "preview_keypoints": out / "preview_keypoints.json",
+            "preview_overlay": out / "preview_overlay.mp4",
+            "profile": out / PROFILE_FILENAME,
+            "profile_summary": out / PROFILE_SUMMARY_FILENAME,
+        }
+
+    def _validate_model(self, model: str) -> None:
+        if model.lower() not in self._registry.supported_models():
+            supported = ", ".join(self._registry.supported_models())
+            raise ValueError(f"Unsupported model '{model}'. Supported: {supported}")
+
+    def _create_record(self, video_id: str, model: str) -> JobRecord:
+        record = JobRecord(job_id=uuid.uuid4().hex, video_id=video_id, model=model)
+        with self._lock:
+            self._jobs[record.job_id] = record
+        JOBS_QUEUED.inc()
+        return record
+
+    def _build_config(
+        self,
+        model: str,
+        every_n_frames: int | None,
+        output_resolution: str | None,
+        save_intermediate_frames: bool | None,
+        profile: bool = False,
+        preview: bool = False,
+        encoding: EncodingOptions | None = None,
+    ) -> ProcessingConfig:
+        return ProcessingConfig(
+            model=model,
+            every_n_frames=every_n_frames or self.default_every_n_frames,
+            output_resolution=output_resolution or self.default_output_resolution,
+            save_intermediate_frames=(
+                self.default_save_intermediate_frames
+                if save_intermediate_frames is None
+                else save_intermediate_frames
+            ),
+            profile=profile,
+            preview=preview,
+            encoding=encoding or EncodingOptions(),
+        )
+
+    def _run_preview(
+        self,
+        job_id: str,
+        video_id: str,
+        input_path: Path,
+        config: ProcessingConfig,
+        model: BasePoseModel | None,
+        cancel: threading.Event | None = None,
+    ) -> dict[str, str]:
+        """Render a sparse, low-resolution pass and publish it before the full render starts."""
+        preview_config = config.model_copy(
+            update={
+                "every_n_frames": max(config.every_n_frames, self.preview_every_n_frames),
+                "output_resolution": self.preview_resolution,
+                "save_intermediate_frames": False,
+            }
+        )
+        outputs = self._processor.process_video(
+            video_id=video_id,
+            input_path=input_path,
+            output_dir=self.outputs_dir / video_id,
+            config=preview_config,
+            model=model,
+            artifact_prefix="preview_",
+            cancel=cancel,
+        )
+        with self._lock:
+            self._jobs[job_id].outputs = dict(outputs)
+        return outputs
+
+    def _prewarm(self, models: list[str]) -> None:
+        for name in models:
+            try:
+                self._validate_model(name)
+                self._registry.warm(name)
+                state = "warm"
+            except Exception as exc:  # pragma: no cover - background error path
+                state = f"failed: {exc}"
+            with self._lock:
+                self._warm_state[name.lower()] = state
+
+    def _run_group(self, model_name: str, jobs: list[tuple[str, str, Path, ProcessingConfig]]) -> None:
+        try:
+            model = self._registry.acquire(model_name)
+        except Exception as exc:  # pragma: no cover - background error path
+            with self._lock:
+                for job_id, *_ in jobs:
+                    record = self._jobs[job_id]
+                    record.status = JobStatus.failed
+                    record.error = str(exc)
+            JOBS_QUEUED.dec(len(jobs))
+            JOBS_TOTAL.inc(len(jobs), status=JobStatus.failed.value)
+            return
+
+        try:
+            for job_id, video_id, input_path, config in jobs:
+                self._run_job(job_id, video_id, input_path, config, model=model)
+        finally:
+            self._registry.release(model_name, model)
+
+    def _clear_stale_outputs(self, output_dir: Path, config: ProcessingConfig) -> None:
+        """Drop artifacts from earlier runs that this run will not replace.
+
+        Keypoints and overlays are swapped in atomically when the run succeeds, so a
+        failed reprocess keeps the last good ones. Frames are written in place, so
+        old ones are always cleared rather than mixed with new ones.
+        """
+        candidates = self._output_candidates(output_dir)
+        stale = []
+        if not config.preview:
+            stale += [candidates["preview_keypoints"], candidates["preview_overlay"]]
+        if not config.profile:
+            stale += [candidates["profile"], candidates["profile_summary"]]
+        for path in stale:
+            path.unlink(missing_ok=True)
+        shutil.rmtree(output_dir / "frames", ignore_errors=True)
+
+    def _verify_reference(self, video_id: str, input_path: Path) -> None:
+        """Run the full reference check, including any content hash, on the job thread."""
+        if input_path.resolve().parent == self.uploads_dir.resolve():
+            return  # reading an upload, link or finished copy, not the referenced source
+        reference = self.uploads_dir / f"{video_id}{local_sources.REFERENCE_SUFFIX}"
+        try:
+            local_sources.resolve_reference(reference)
+        except FileNotFoundError:
+            if reference.exists():
+                raise  # the source is gone; a missing reference means there is nothing to check
+
+    def _video_lock(self, video_id: str) -> threading.Lock:
+        with self._lock:
+            return self._video_locks.setdefault(video_id, threading.Lock())
+
+    def _run_job(
+        self,
+        job_id: str,
+        video_id: str,
+        input_path: Path,
+        config: ProcessingConfig,
+        model: BasePoseModel | None = None,
+        cancel: threading.Event | None = None,
+    ) -> None:
+        with self._video_lock(video_id):
+            self._process_job(job_id, video_id, input_path, config, model, cancel)
+
+    def _process_job(
+        self,
+        job_id: str,
+        video_id: str,
+        input_path: Path,
+        config: ProcessingConfig,
+        model: BasePoseModel | None,
+        cancel: threading.Event | None,
+    ) -> None:
         with self._lock:
             record = self._jobs[job_id]
             record.status = JobStatus.running
+        JOBS_QUEUED.dec()
+        JOBS_RUNNING.inc()
 
+        timer = StageTimer()
+        start = time.perf_counter()
+        status = JobStatus.failed
+        output_dir = self.outputs_dir / video_id
+        preview_outputs: dict[str, str] = {}
+        preview_seconds: dict[str, float] = {}
         try:
-            outputs = self._processor.process_video(
-                video_id=video_id,
-                input_path=input_path,
-                output_dir=self.outputs_dir / video_id,
-                config=config,
-            )
+            self._verify_reference(video_id, input_path)
+            self._clear_stale_outputs(output_dir, config)
+            with profile_job(output_dir) if config.profile else nullcontext():
+                if config.preview:
+                    preview_outputs = self._run_preview(job_id, video_id, input_path, config, model, cancel)
+                    preview_seconds["preview"] = time.perf_counter() - start
+                outputs = self._processor.process_video(
+                    video_id=video_id,
+                    input_path=input_path,
+                    output_dir=output_dir,
+                    config=config,
+                    model=model,
+                    timer=timer,
+                    cancel=cancel,
+                )
+            outputs = {**preview_outputs, **outputs}
+            if config.profile:
+                outputs["profile"] = str(output_dir / PROFILE_FILENAME)
+                outputs["profile_summary"] = str(output_dir / PROFILE_SUMMARY_FILENAME)
+            status = JobStatus.completed
             with self._lock:
                 record = self._jobs[job_id]
                 record.status = JobStatus.completed
                 record.outputs = outputs
+                listeners = list(self._completion_listeners)
+            for listener in listeners:
+                try:
+                    listener(record)
+                except Exception:  # pragma: no cover - listeners must not fail the job
+                    pass
         except Exception as exc:  # pragma: no cover - background error path
             with self._lock:
                 record = self._jobs[job_id]
                 record.status = JobStatus.failed
                 record.error = str(exc)
+        finally:
+            elapsed = time.perf_counter() - start
+            fps = timer.frames / elapsed if timer.frames and elapsed > 0 else None
+            with self._lock:
+                record = self._jobs[job_id]
+                record.timings = {**timer.totals, **preview_seconds, "total": elapsed}
+                record.frames_per_second = fps
+            JOBS_RUNNING.dec()
+            JOBS_TOTAL.inc(status=status.value)
+            JOB_SECONDS.observe(elapsed, model=config.model.lower(), status=status.value)
+            if fps is not None:
+                JOB_FRAMES_PER_SECOND.observe(fps, model=config.model.lower())
@@ -0,0 +1,242 @@
+"""Durable job queue in a SQLite file shared by API nodes and workers.
+
+API processes enqueue jobs and read their status; ``python -m app.worker``
+processes claim them. A claimed job is owned by one worker, which must
+heartbeat it. Jobs whose heartbeat is older than ``stale_seconds`` are put back
+in the queue (or failed after ``max_attempts`` claims) so a crashed worker does
+not strand them. Heartbeats use wall-clock time, so hosts need roughly
+synchronised clocks.
+
+The database uses SQLite's rollback journal rather than WAL: WAL needs every
+process on one host (it shares a memory-mapped index), while the rollback
+journal works across hosts as long as the shared filesystem implements POSIX
+advisory locks correctly (e.g. NFSv4 with locking enabled; not SMB/CIFS
+mounts with ``nobrl`` or NFS with ``nolock``).
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.schemas.pose import JobStatus, ProcessingConfig
+from app.services.job_manager import JobRecord
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    video_id TEXT NOT NULL,
+    model TEXT NOT NULL,
+    input_path TEXT NOT NULL,
+    config_json TEXT NOT NULL,
+    batch_id TEXT,
+    status TEXT NOT NULL,
+    error TEXT,
+    outputs_json TEXT NOT NULL DEFAULT '{}',
+    timings_json TEXT NOT NULL DEFAULT '{}',
+    frames_per_second REAL,
+    worker_id TEXT,
+    heartbeat_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_batch ON jobs (batch_id);
+"""
+
+
+@dataclass
+class ClaimedJob:
+    job_id: str
+    video_id: str
+    model: str
+    input_path: Path
+    config: ProcessingConfig
+    attempts: int
+
+
+class SQLiteJobQueue:
+    def __init__(self, path: Path, stale_seconds: float = 60.0, max_attempts: int = 3) -> None:
+        self.path = path
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per call keeps this safe to use from any thread.
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction that takes the database lock up front, so claims never race."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def enqueue(
+        self,
+        job_id: str,
+        video_id: str,
+        model: str,
+        input_path: Path,
+        config: ProcessingConfig,
+        batch_id: str | None = None,
+    ) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, video_id, model, input_path, config_json, batch_id, status, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    video_id,
+                    model,
+                    # Absolute, so workers started from another working directory can open it.
+                    str(input_path.resolve()),
+                    config.model_dump_json(),
+                    batch_id,
+                    JobStatus.pending.value,
+                    time.time(),
+                ),
+            )
+
+    def claim(self, worker_id: str, models: list[str] | None = None) -> ClaimedJob | None:
+        """Take ownership of the oldest pending job (optionally only for ``models``).
+
+        Jobs for a video that another worker is already running are skipped: both
+        would write into the same ``outputs/<video_id>`` directory.
+        """
+        query = (
+            "SELECT * FROM jobs WHERE status = ?"
+            " AND video_id NOT IN (SELECT video_id FROM jobs WHERE status = ?)"
+        )
+        params: list[object] = [JobStatus.pending.value, JobStatus.running.value]
+        if models:
+            query += f" AND lower(model) IN ({', '.join('?' for _ in models)})"
+            params.extend(name.lower() for name in models)
+        query += " ORDER BY created_at LIMIT 1"
+
+        now = time.time()
+        with self._transaction() as conn:
+            self._reclaim_stale(conn, now)
+            row = conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, heartbeat_at = ?, attempts = attempts + 1"
+                " WHERE job_id = ?",
+                (JobStatus.running.value, worker_id, now, row["job_id"]),
+            )
+        return ClaimedJob(
+            job_id=row["job_id"],
+            video_id=row["video_id"],
+            model=row["model"],
+            input_path=Path(row["input_path"]),
+            config=ProcessingConfig.model_validate_json(row["config_json"]),
+            attempts=row["attempts"] + 1,
+        )
+
+    def heartbeat(self, job_id: str, worker_id: str, outputs: dict[str, str] | None = None) -> bool:
+        """Refresh the lease (and publish partial outputs). False means the job was reclaimed."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET heartbeat_at = ?, outputs_json = coalesce(?, outputs_json)"
+                " WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (
+                    time.time(),
+                    json.dumps(outputs) if outputs is not None else None,
+                    job_id,
+                    worker_id,
+                    JobStatus.running.value,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def finish(self, record: JobRecord, worker_id: str) -> bool:
+        """Record the final state. False means another worker owns the job now."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, outputs_json = ?, timings_json = ?,"
+                " frames_per_second = ?, heartbeat_at = ?"
+                " WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (
+                    record.status.value,
+                    record.error,
+                    json.dumps(record.outputs),
+                    json.dumps(record.timings),
+                    record.frames_per_second,
+                    time.time(),
+                    record.job_id,
+                    worker_id,
+                    JobStatus.running.value,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def reclaim_stale(self) -> int:
+        with self._transaction() as conn:
+            return self._reclaim_stale(conn, time.time())
+
+    def get(self, job_id: str) -> JobRecord:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise KeyError(job_id)
+        return self._to_record(row)
+
+    def batch_jobs(self, batch_id: str) -> list[JobRecord]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE batch_id = ? ORDER BY created_at, rowid", (batch_id,)
+            ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def _reclaim_stale(self, conn: sqlite3.Connection, now: float) -> int:
+        cutoff = now - self.stale_seconds
+        failed = conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, worker_id = NULL"
+            " WHERE status = ? AND heartbeat_at < ? AND attempts >= ?",
+            (
+                JobStatus.failed.value,
+                f"Abandoned after {self.max_attempts} attempts without a worker heartbeat",
+                JobStatus.running.value,
+                cutoff,
+                self.max_attempts,
+            ),
+        ).rowcount
+        requeued = conn.execute(
+            "UPDATE jobs SET status = ?, worker_id = NULL WHERE status = ? AND heartbeat_at < ?",
+            (JobStatus.pending.value, JobStatus.running.value, cutoff),
+        ).rowcount
+        return failed + requeued
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> JobRecord:
+        return JobRecord(
+            job_id=row["job_id"],
+            video_id=row["video_id"],
+            model=row["model"],
+            status=JobStatus(row["status"]),
+            error=row["error"],
+            outputs=json.loads(row["outputs_json"]),
+            timings=json.loads(row["timings_json"]),
+            frames_per_second=row["frames_per_second"],
+        )
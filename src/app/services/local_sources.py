@@ -0,0 +1,144 @@
+"""Register local video files without copying them into the uploads directory."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+REFERENCE_SUFFIX = ".ref.json"
+REGISTRATION_MODES = ("auto", "reference", "copy")
+VERIFY_MODES = ("stat", "hash")
+
+# Linux FICLONE ioctl: share extents copy-on-write (btrfs, XFS, some NAS filesystems).
+_FICLONE = 0x40049409
+
+# Serializes reference rewrites with copy_into_place dropping the reference, so a
+# late hash or mtime update never brings back a reference the copy replaced.
+_reference_lock = threading.Lock()
+
+
+class SourceChangedError(ValueError):
+    """Raised when a referenced source no longer matches what was registered."""
+
+
+def hardlink(src: Path, dst: Path) -> bool:
+    try:
+        os.link(src, dst)
+    except OSError:
+        return False
+    return True
+
+
+def reflink(src: Path, dst: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - not available on Windows
+        return False
+
+    try:
+        with src.open("rb") as src_file, dst.open("wb") as dst_file:
+            fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_reference_data(reference_path: Path, data: dict, replace_only: bool = False) -> bool:
+    """Atomically write a reference. With ``replace_only``, skip it unless one still exists."""
+    partial = reference_path.with_name(f".{reference_path.name}.{uuid.uuid4().hex[:8]}.partial")
+    try:
+        partial.write_text(json.dumps(data), encoding="utf-8")
+        with _reference_lock:
+            if replace_only and not reference_path.exists():
+                return False
+            os.replace(partial, reference_path)
+    finally:
+        partial.unlink(missing_ok=True)
+    return True
+
+
+def write_reference(reference_path: Path, source: Path) -> None:
+    """Record the source's size and mtime; see record_hash for the content hash."""
+    stat = source.stat()
+    data = {
+        "path": str(source),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": None,
+    }
+    _write_reference_data(reference_path, data)
+
+
+def record_hash(reference_path: Path) -> None:
+    """Add the source's sha256 to its reference. Reads the whole file, so run it off the request thread.
+
+    Nothing is recorded if the source changed since registration (the hash would
+    describe different content) or if the reference was removed meanwhile.
+    """
+    try:
+        data = json.loads(reference_path.read_text(encoding="utf-8"))
+        source = Path(data["path"])
+        digest = sha256_file(source)
+        stat = source.stat()
+    except FileNotFoundError:
+        return
+    if (stat.st_size, stat.st_mtime_ns) != (data["size"], data["mtime_ns"]):
+        return
+    data["sha256"] = digest
+    _write_reference_data(reference_path, data, replace_only=True)
+
+
+def resolve_reference(reference_path: Path, verify_content: bool = True) -> Path:
+    """Return the referenced source if it is unchanged since registration.
+
+    Size and mtime are checked first. When they differ and a hash was recorded,
+    the content hash decides (e.g. the file was only touched or re-synced). With
+    ``verify_content=False`` that hash check is skipped and the source is
+    returned, so request handlers stay cheap and the job thread verifies later.
+    Raises FileNotFoundError if the source is gone and SourceChangedError if it changed.
+    """
+    data = json.loads(reference_path.read_text(encoding="utf-8"))
+    source = Path(data["path"])
+    try:
+        stat = source.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Referenced source '{source}' no longer exists") from None
+
+    if stat.st_size == data["size"] and stat.st_mtime_ns == data["mtime_ns"]:
+        return source
+    if data.get("sha256") and stat.st_size == data["size"]:
+        if not verify_content:
+            return source
+        if sha256_file(source) == data["sha256"]:
+            data["mtime_ns"] = stat.st_mtime_ns
+            _write_reference_data(reference_path, data, replace_only=True)
+            return source
+    raise SourceChangedError(f"Referenced source '{source}' changed since it was registered")
+
+
+def copy_into_place(source: Path, dst: Path, reference_path: Path) -> None:
+    """Copy source to dst atomically, then drop the reference that covered the gap."""
+    partial = dst.with_name(f".{dst.name}.partial")
+    try:
+        shutil.copy2(source, partial)
+        os.replace(partial, dst)
+    except OSError:  # pragma: no cover - keep serving from the reference
+        partial.unlink(missing_ok=True)
+        return
+    with _reference_lock:
+        reference_path.unlink(missing_ok=True)
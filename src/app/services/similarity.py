@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import uuid
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from app.schemas.climbs import SimilarClimb, SimilarClimbsResponse
+from app.services.climb_metrics import HIPS, SHOULDERS, load_keypoint_series
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    Trajectory = npt.NDArray[np.float32]  # (length, features)
+
+INDEX_DIRNAME = ".similarity"
+
+logger = logging.getLogger(__name__)
+
+
+def embed_keypoints(path: Path, length: int = 64) -> Trajectory | None:
+    """Turn a keypoints.json into a fixed-length, body-normalised pose trajectory.
+
+    Each frame is centred on the hip midpoint and scaled by torso length, so
+    the embedding ignores where the climber is in frame and how far the camera
+    is. The detected frames are then resampled to ``length`` steps. Returns None
+    when fewer than two frames have a pose.
+    """
+    import numpy as np
+
+    series = load_keypoint_series(path)
+    detected = ~np.isnan(series.xy).all(axis=(1, 2))
+    if detected.sum() < 2:
+        return None
+
+    xy = series.xy[detected]
+    t = series.frame_index[detected].astype(np.float64)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)  # all-NaN slices are expected
+        hip_mid = np.nanmean(xy[:, HIPS], axis=1, keepdims=True)
+        shoulder_mid = np.nanmean(xy[:, SHOULDERS], axis=1, keepdims=True)
+        torso = float(np.nanmedian(np.linalg.norm(shoulder_mid - hip_mid, axis=2)))
+        # Without hips, centre on whatever joints were seen in that frame.
+        hip_mid = np.where(np.isnan(hip_mid), np.nanmean(xy, axis=1, keepdims=True), hip_mid)
+    if not np.isfinite(torso) or torso <= 0:
+        torso = 1.0
+
+    features = ((xy - hip_mid) / torso).reshape(len(t), -1)
+    grid = np.linspace(t[0], t[-1], length)
+    out = np.zeros((length, features.shape[1]), dtype=np.float32)
+    for col in range(features.shape[1]):
+        seen = ~np.isnan(features[:, col])
+        if seen.any():
+            out[:, col] = np.interp(grid, t[seen], features[seen, col])
+    return out
+
+
+def lb_keogh(query: Trajectory, candidates: npt.NDArray[np.float32], window: int) -> npt.NDArray[np.float64]:
+    """LB_Keogh lower bound of banded DTW between ``query`` and every candidate at once."""
+    import numpy as np
+
+    length = query.shape[0]
+    padded = np.pad(query, ((window, window), (0, 0)), mode="edge")
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * window + 1, axis=0)[:length]
+    upper = windows.max(axis=2)
+    lower = windows.min(axis=2)
+    above = np.clip(candidates - upper, 0, None)
+    below = np.clip(lower - candidates, 0, None)
+    return (above**2 + below**2).sum(axis=(1, 2))
+
+
+def dtw_distance(a: Trajectory, b: Trajectory, window: int, best_so_far: float = float("inf")) -> float:
+    """Squared-Euclidean DTW with a Sakoe-Chiba band; abandons early once a row exceeds best_so_far."""
+    import numpy as np
+
+    n, m = a.shape[0], b.shape[0]
+    cost = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+    previous = np.full(m + 1, np.inf)
+    previous[0] = 0.0
+    for i in range(1, n + 1):
+        current = np.full(m + 1, np.inf)
+        for j in range(max(1, i - window), min(m, i + window) + 1):
+            current[j] = cost[i - 1, j - 1] + min(previous[j], current[j - 1], previous[j - 1])
+        if current.min() > best_so_far:
+            return float("inf")
+        previous = current
+    return float(previous[m])
+
+
+class SimilarityIndex:
+    """k-NN over stored pose trajectories using LB_Keogh pruning before full DTW.
+
+    Embeddings live as one small ``.npy`` per video under
+    ``outputs_dir/.similarity`` and are refreshed when the video's keypoints are
+    newer than its embedding. Queries re-embed the query video if it changed and
+    start a background re-sync once the last one is older than ``refresh_seconds``,
+    so outputs written by other processes (queue workers) are picked up too.
+    """
+
+    def __init__(
+        self,
+        outputs_dir: Path,
+        length: int = 64,
+        window_ratio: float = 0.1,
+        refresh_seconds: float = 30.0,
+    ) -> None:
+        self.outputs_dir = outputs_dir
+        self.index_dir = outputs_dir / INDEX_DIRNAME
+        self.length = length
+        self.window = max(1, int(length * window_ratio))
+        self.refresh_seconds = refresh_seconds
+        self._embeddings: dict[str, Trajectory] = {}
+        # keypoints.json mtime each embedding was built from
+        self._versions: dict[str, int] = {}
+        self._matrix: tuple[list[str], npt.NDArray[np.float32]] | None = None
+        self._last_sync: float | None = None
+        self._sync_thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+    def sync(self) -> None:
+        """Load stored embeddings, (re)build missing or stale ones and drop removed videos."""
+        with self._sync_lock:
+            seen: set[str] = set()
+            for keypoints in self.outputs_dir.glob("*/keypoints.json"):
+                video_id = keypoints.parent.name
+                seen.add(video_id)
+                try:
+                    self._sync_one(video_id, keypoints)
+                except FileNotFoundError:  # replaced or cleared while scanning
+                    continue
+                except Exception:
+                    # One unreadable video must not stop the rest of the index from syncing.
+                    logger.exception("similarity: could not index %s", video_id)
+
+            with self._lock:
+                removed = set(self._embeddings) - seen
+            for video_id in removed:
+                self.update(video_id)
+            self._last_sync = time.monotonic()
+
+    def _sync_one(self, video_id: str, keypoints: Path) -> None:
+        import numpy as np
+
+        version = keypoints.stat().st_mtime_ns
+        with self._lock:
+            if self._versions.get(video_id) == version:
+                return
+        stored = self.index_dir / f"{video_id}.npy"
+        if stored.exists() and stored.stat().st_mtime_ns >= version:
+            embedding = np.load(stored)
+            with self._lock:
+                self._embeddings[video_id] = embedding
+                self._versions[video_id] = version
+                self._matrix = None
+        else:
+            self.update(video_id)
+
+    def sync_in_background(self) -> None:
+        with self._lock:
+            if self._sync_thread is not None and self._sync_thread.is_alive():
+                return
+            self._sync_thread = threading.Thread(target=self.sync, name="similarity-sync", daemon=True)
+            self._sync_thread.start()
+
+    def update(self, video_id: str) -> None:
+        import numpy as np
+
+        keypoints = self.outputs_dir / video_id / "keypoints.json"
+        try:
+            version = keypoints.stat().st_mtime_ns
+            embedding = embed_keypoints(keypoints, self.length)
+        except FileNotFoundError:
+            embedding = None
+        stored = self.index_dir / f"{video_id}.npy"
+        with self._lock:
+            self._matrix = None
+            if embedding is None:
+                self._embeddings.pop(video_id, None)
+                self._versions.pop(video_id, None)
+                stored.unlink(missing_ok=True)
+                return
+            self._embeddings[video_id] = embedding
+            self._versions[video_id] = version
+
+        # Unique per call: sync threads, completion listeners and other API nodes may write the same video.
+        partial = self.index_dir / f".{video_id}.{uuid.uuid4().hex[:8]}.partial.npy"
+        try:
+            np.save(partial, embedding)
+            os.replace(partial, stored)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    def _refresh(self, video_id: str) -> None:
+        keypoints = self.outputs_dir / video_id / "keypoints.json"
+        try:
+            version = keypoints.stat().st_mtime_ns
+        except FileNotFoundError:
+            version = None
+        with self._lock:
+            stale = self._versions.get(video_id) != version
+        if stale:
+            self.update(video_id)
+        if self._last_sync is None or time.monotonic() - self._last_sync > self.refresh_seconds:
+            self.sync_in_background()
+
+    def query(self, video_id: str, k: int = 5) -> SimilarClimbsResponse:
+        """Raises KeyError if ``video_id`` has no embedding."""
+        import numpy as np
+
+        self._refresh(video_id)
+        with self._lock:
+            query = self._embeddings[video_id]
+            if self._matrix is None:
+                ids = sorted(self._embeddings)
+                self._matrix = (ids, np.stack([self._embeddings[i] for i in ids]))
+            ids, matrix = self._matrix
+
+        mask = np.array([other != video_id for other in ids], dtype=bool)
+        ids = [other for other in ids if other != video_id]
+        candidates = matrix[mask]
+        bounds = lb_keogh(query, candidates, self.window)
+
+        best: list[tuple[float, str]] = []
+        evaluated = 0
+        for idx in np.argsort(bounds):
+            kth = best[-1][0] if len(best) == k else float("inf")
+            if bounds[idx] >= kth:
+                break
+            evaluated += 1
+            distance = dtw_distance(query, candidates[idx], self.window, kth)
+            if distance < kth:
+                best.append((distance, ids[idx]))
+                best.sort()
+                del best[k:]
+
+        return SimilarClimbsResponse(
+            video_id=video_id,
+            results=[SimilarClimb(video_id=other, distance=float(np.sqrt(d))) for d, other in best],
+            candidates=len(ids),
+            dtw_evaluations=evaluated,
+        )
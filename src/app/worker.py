@@ -0,0 +1,141 @@
+"""Queue worker: claims jobs from the shared SQLite queue and runs them with VideoProcessor.
+
+Run one per compute host (uploads, outputs and the queue file must be on
+storage shared with the API nodes, which need ``JOB_BACKEND=queue``):
+
+    python -m app.worker --worker-id gpu-1 --models openpose
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+from app.services.job_manager import JobManager, JobRecord
+from app.services.job_queue import ClaimedJob, SQLiteJobQueue
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    def __init__(
+        self,
+        manager: JobManager,
+        job_queue: SQLiteJobQueue,
+        worker_id: str,
+        models: list[str] | None = None,
+        poll_interval: float = 1.0,
+        heartbeat_interval: float = 10.0,
+    ) -> None:
+        self.manager = manager
+        self.job_queue = job_queue
+        self.worker_id = worker_id
+        self.models = models
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+
+    def run_once(self) -> bool:
+        """Claim and process one job. Returns False when the queue had nothing for us."""
+        claimed = self.job_queue.claim(self.worker_id, self.models)
+        if claimed is None:
+            return False
+        self._process(claimed)
+        return True
+
+    def run(self, stop: threading.Event, drain: bool = False) -> None:
+        """Process jobs until ``stop`` is set, or until the queue is empty when ``drain``."""
+        while not stop.is_set():
+            if self.run_once():
+                continue
+            if drain:
+                return
+            stop.wait(self.poll_interval)
+
+    def _process(self, claimed: ClaimedJob) -> None:
+        logger.info("worker %s: job %s (attempt %d)", self.worker_id, claimed.job_id, claimed.attempts)
+        record = JobRecord(job_id=claimed.job_id, video_id=claimed.video_id, model=claimed.model)
+        done = threading.Event()
+        cancel = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(record, done, cancel), daemon=True)
+        heartbeat.start()
+        try:
+            self.manager.run_job(record, claimed.input_path, claimed.config, cancel=cancel)
+        finally:
+            done.set()
+            heartbeat.join()
+
+        if not self.job_queue.finish(record, self.worker_id):
+            logger.warning("worker %s: job %s was reclaimed; result dropped", self.worker_id, record.job_id)
+        else:
+            logger.info("worker %s: job %s %s", self.worker_id, record.job_id, record.status.value)
+
+    def _heartbeat(self, record: JobRecord, done: threading.Event, cancel: threading.Event) -> None:
+        last_renewed = time.monotonic()
+        while not done.wait(self.heartbeat_interval):
+            try:
+                renewed = self.job_queue.heartbeat(record.job_id, self.worker_id, dict(record.outputs))
+            except Exception:
+                # E.g. "database is locked" on a busy shared mount: retry on the next tick,
+                # but once the lease has had time to go stale another worker may take the job.
+                if time.monotonic() - last_renewed < self.job_queue.stale_seconds:
+                    logger.warning(
+                        "worker %s: heartbeat for job %s failed; retrying",
+                        self.worker_id,
+                        record.job_id,
+                        exc_info=True,
+                    )
+                    continue
+                logger.error(
+                    "worker %s: could not renew the lease on job %s; cancelling", self.worker_id, record.job_id
+                )
+                cancel.set()
+                return
+            if not renewed:
+                # Another worker owns the job now; stop before we write over its outputs.
+                logger.warning("worker %s: lost the lease on job %s; cancelling", self.worker_id, record.job_id)
+                cancel.set()
+                return
+            last_renewed = time.monotonic()
+
+def main(argv: list[str] | None = None) -> int:
+    from app.api.deps import get_job_manager, get_job_queue
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    parser.add_argument("--models", default="", help="comma-separated models to claim (default: any)")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds to sleep when idle")
+    parser.add_argument("--heartbeat-interval", type=float, default=settings.job_heartbeat_seconds)
+    parser.add_argument("--drain", action="store_true", help="exit once the queue is empty")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    manager = get_job_manager()
+    models = [name.strip() for name in args.models.split(",") if name.strip()] or None
+    for name in settings.prewarm_models:
+        manager.registry.warm(name)
+
+    worker = Worker(
+        manager,
+        get_job_queue(),
+        worker_id=args.worker_id,
+        models=models,
+        poll_interval=args.poll_interval,
+        heartbeat_interval=args.heartbeat_interval,
+    )
+    stop = threading.Event()
+    # Finish the current job, then exit.
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    worker.run(stop, drain=args.drain)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import cv2
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_job_manager
+from app.main import app
+from app.models.pose.mediapipe_model import MediaPipePoseModel
+from app.schemas.pose import PoseResult
+from app.services.job_manager import JobManager
+
+
+class SlowModel(MediaPipePoseModel):
+    """MediaPipe stub whose frames sleep ``latency`` and then wait for ``gate``.
+
+    The first ``free_streams`` videos it processes (counted by reset, so a
+    preview counts as one) skip the gate.
+    """
+
+    name = "slow"
+    latency = 0.0
+    free_streams = 0
+    streams = 0
+    gate: threading.Event
+
+    def reset(self) -> None:
+        super().reset()
+        type(self).streams += 1
+
+    def infer(self, frame) -> PoseResult:  # type: ignore[no-untyped-def]
+        time.sleep(self.latency)
+        if self.streams > self.free_streams:
+            self.gate.wait()
+        return super().infer(frame)
+
+
+@pytest.fixture
+def make_manager(tmp_path: Path) -> Callable[..., JobManager]:
+    """Build JobManagers over the test's data dirs; keyword arguments override the defaults."""
+
+    def make(**overrides: Any) -> JobManager:
+        options: dict[str, Any] = {
+            "uploads_dir": tmp_path / "uploads",
+            "outputs_dir": tmp_path / "outputs",
+            "default_every_n_frames": 1,
+            "default_output_resolution": "original",
+            "default_save_intermediate_frames": False,
+            "max_video_seconds": 180,
+        }
+        return JobManager(**{**options, **overrides})
+
+    return make
+
+
+@pytest.fixture
+def manager(request: pytest.FixtureRequest, make_manager: Callable[..., JobManager]) -> JobManager:
+    """Parametrize indirectly with a dict of JobManager options to change the defaults."""
+    return make_manager(**getattr(request, "param", {}))
+
+
+@pytest.fixture
+def client(manager: JobManager) -> Iterator[TestClient]:
+    app.dependency_overrides[get_job_manager] = lambda: manager
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_job_manager, None)
+
+
+@pytest.fixture
+def slow_model() -> Iterator[type[SlowModel]]:
+    """A SlowModel class with its own closed gate; register it and call ``gate.set()`` to let jobs finish."""
+    model = type("SlowModel", (SlowModel,), {"gate": threading.Event()})
+    try:
+        yield model
+    finally:
+        model.gate.set()  # never leave a job thread blocked
+
+
+@pytest.fixture
+def sample_video(tmp_path: Path) -> Path:
+    path = tmp_path / "sample.mp4"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 10.0, (64, 48))
+    for i in range(8):
+        frame = np.full((48, 64, 3), i * 20, dtype=np.uint8)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+@pytest.fixture
+def wait_for_job(client: TestClient) -> Callable[[str], dict]:
+    def wait(job_id: str, timeout: float = 20.0) -> dict:
+        deadline = time.monotonic() + timeout
+        while True:
+            body = client.get(f"/api/v1/jobs/{job_id}").json()
+            if body["status"] in {"completed", "failed"} or time.monotonic() > deadline:
+                return body
+            time.sleep(0.05)
+
+    return wait
@@ -0,0 +1,110 @@
+import json
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.models.pose.mediapipe_model import MediaPipePoseModel
+from app.schemas.pose import PoseResult
+from app.services.job_manager import JobManager
+
+
+class TrackingModel(MediaPipePoseModel):
+    """Records how many frames each stream saw since the last reset, like a tracker's carried-over state."""
+
+    name = "tracking"
+    streams: list[int] = []
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.frames_since_reset = 0
+
+    def reset(self) -> None:
+        super().reset()
+        self.frames_since_reset = 0
+        TrackingModel.streams.append(0)
+
+    def infer(self, frame) -> PoseResult:  # type: ignore[no-untyped-def]
+        self.frames_since_reset += 1
+        TrackingModel.streams[-1] = self.frames_since_reset
+        return super().infer(frame)
+
+
+def _wait_for_batch(client: TestClient, batch_id: str, timeout: float = 20.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        body = client.get(f"/api/v1/batches/{batch_id}").json()
+        if body["status"] in {"completed", "failed"} or time.monotonic() > deadline:
+            return body
+        time.sleep(0.05)
+
+
+def test_batch_runs_all_items(client: TestClient, manager: JobManager, sample_video: Path) -> None:
+    video_ids = [manager.register_local_video(sample_video)[0] for _ in range(3)]
+    items = [{"video_id": video_id, "model": "mediapipe"} for video_id in video_ids]
+    items[-1]["model"] = "openpose"
+    items[-1]["every_n_frames"] = 2
+
+    response = client.post("/api/v1/batches", json={"items": items})
+    assert response.status_code == 200
+    body = response.json()
+    assert [job["video_id"] for job in body["jobs"]] == video_ids
+
+    status = _wait_for_batch(client, body["batch_id"])
+    assert status["status"] == "completed"
+    assert status["total"] == 3
+    assert status["counts"]["completed"] == 3
+    for video_id in video_ids:
+        assert "keypoints" in manager.list_result_files(video_id)
+
+
+def test_batch_rejects_unknown_video(client: TestClient, manager: JobManager, sample_video: Path) -> None:
+    video_id, _ = manager.register_local_video(sample_video)
+    response = client.post(
+        "/api/v1/batches",
+        json={"items": [{"video_id": video_id}, {"video_id": "missing-id"}]},
+    )
+    assert response.status_code == 404
+
+
+def test_batch_rejects_unknown_model(client: TestClient, manager: JobManager, sample_video: Path) -> None:
+    video_id, _ = manager.register_local_video(sample_video)
+    response = client.post(
+        "/api/v1/batches",
+        json={"items": [{"video_id": video_id, "model": "nope"}]},
+    )
+    assert response.status_code == 400
+
+
+def test_unknown_batch_returns_404(client: TestClient) -> None:
+    assert client.get("/api/v1/batches/not-found").status_code == 404
+
+
+def test_batch_runs_same_video_items_one_after_another(
+    client: TestClient, manager: JobManager, sample_video: Path
+) -> None:
+    video_id, _ = manager.register_local_video(sample_video)
+    items = [{"video_id": video_id, "model": "mediapipe"}, {"video_id": video_id, "model": "openpose"}]
+
+    response = client.post("/api/v1/batches", json={"items": items})
+    assert response.status_code == 200
+
+    status = _wait_for_batch(client, response.json()["batch_id"])
+    assert status["counts"]["completed"] == 2, [job["error"] for job in status["jobs"]]
+    out = manager.outputs_dir / video_id
+    assert sorted(p.name for p in out.iterdir()) == ["keypoints.json", "overlay.mp4"]
+    payload = json.loads((out / "keypoints.json").read_text(encoding="utf-8"))
+    assert payload["model"] in {"mediapipe", "openpose"}
+
+
+def test_pooled_model_is_reset_for_every_video(client: TestClient, manager: JobManager, sample_video: Path) -> None:
+    TrackingModel.streams = []
+    manager.registry.register("tracking", TrackingModel)
+    video_ids = [manager.register_local_video(sample_video)[0] for _ in range(2)]
+    items = [{"video_id": video_id, "model": "tracking", "preview": True} for video_id in video_ids]
+
+    response = client.post("/api/v1/batches", json={"items": items})
+    status = _wait_for_batch(client, response.json()["batch_id"])
+    assert status["counts"]["completed"] == 2, [job["error"] for job in status["jobs"]]
+    # A preview and a full render per video, each starting from a fresh state.
+    assert TrackingModel.streams == [2, 8, 2, 8]
@@ -0,0 +1,69 @@
+import asyncio
+import json
+from pathlib import Path
+
+import cv2
+
+from benchmarks import bench_pipeline, loadtest
+from benchmarks.synthetic import write_synthetic_video
+
+
+def test_synthetic_video_matches_requested_shape(tmp_path: Path) -> None:
+    path = write_synthetic_video(tmp_path / "clip.mp4", seconds=0.5, width=96, height=64, fps=10)
+    capture = cv2.VideoCapture(str(path))
+    try:
+        assert int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)) == 96
+        assert int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)) == 64
+        assert int(capture.get(cv2.CAP_PROP_FRAME_COUNT)) == 5
+    finally:
+        capture.release()
+
+
+def test_compare_flags_only_slower_metrics() -> None:
+    def report(total: float, infer: float) -> dict:
+        return {
+            "scenarios": {"every_frame": {"total_seconds": total, "stages": {"infer": infer}}},
+            "registry": {"warm_create_seconds": 0.0001},
+        }
+
+    regressions = bench_pipeline.compare(report(1.5, 0.09), report(1.0, 0.1), tolerance=0.2)
+    assert [item["metric"] for item in regressions] == ["scenarios.every_frame.total_seconds"]
+
+
+def test_benchmark_cli_writes_report(tmp_path: Path) -> None:
+    output = tmp_path / "bench.json"
+    exit_code = bench_pipeline.main(
+        [
+            "--seconds", "0.3",
+            "--resolution", "96x64",
+            "--repeat", "1",
+            "--scenario", "every_frame",
+            "--output", str(output),
+        ]
+    )
+    assert exit_code == 0
+    report = json.loads(output.read_text())
+    assert "decode" in report["scenarios"]["every_frame"]["stages"]
+    assert report["registry"]["cold_create_seconds"] >= 0
+
+
+def test_load_test_drives_full_flow_with_stub_model(tmp_path: Path) -> None:
+    clip = write_synthetic_video(tmp_path / "clip.mp4", seconds=0.3, width=64, height=48, fps=10)
+    manager = loadtest.build_manager(tmp_path, lambda: loadtest.StubPoseModel(latency_seconds=0.001))
+
+    report = asyncio.run(
+        loadtest.run_load_test(manager, clip.read_bytes(), clients=4, concurrency=2, poll_interval=0.01)
+    )
+
+    assert report["failures"] == []
+    assert report["jobs_completed"] == 4
+    assert {"upload", "process", "job_status", "download_overlay", "download_keypoints"} <= set(
+        report["endpoints"]
+    )
+    assert report["endpoints"]["upload"]["count"] == 4
+
+
+def test_percentile_interpolates() -> None:
+    assert loadtest.percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert loadtest.percentile([5.0], 99) == 5.0
+    assert loadtest.percentile([], 95) == 0.0
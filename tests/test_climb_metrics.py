@@ -0,0 +1,85 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.climb_metrics import ClimbMetricsService, compute_metrics, load_keypoint_series
+from app.services.job_manager import JobManager
+
+
+def _write_keypoints(path: Path, fps: float = 10.0) -> Path:
+    """20 frames: still for 1s, then the body rises 100px/s; torso is 100px tall."""
+    frames = []
+    for i in range(20):
+        lift = 0.0 if i < 10 else 10.0 * (i - 9)
+        points = {
+            "11": (90, 200 - lift), "12": (110, 200 - lift),
+            "23": (90, 300 - lift), "24": (110, 300 - lift),
+            "15": (60, 120), "16": (140, 120), "27": (60, 380), "28": (140, 380),
+        }
+        frames.append(
+            {
+                "frame_index": i,
+                "keypoints": [
+                    {"name": name, "x": x, "y": y, "confidence": 0.9} for name, (x, y) in points.items()
+                ],
+                "confidence": 0.9,
+                "bbox": None,
+            }
+        )
+    payload = {"video_id": "v1", "model": "mediapipe", "frames": frames, "meta": {"fps": fps, "every_n_frames": 1}}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload))
+    return path
+
+
+def test_metrics_from_known_motion(tmp_path: Path) -> None:
+    series = load_keypoint_series(_write_keypoints(tmp_path / "v1" / "keypoints.json"))
+    assert series.xy.shape == (20, 12, 2)
+
+    result = compute_metrics(series)
+    assert result.torso_length_px == pytest.approx(100.0)
+    assert result.detected_frames == 20
+    assert result.time_on_wall_s == pytest.approx(2.0)
+    assert result.joints["left_hip"].max_speed == pytest.approx(1.0)
+    assert result.joints["left_wrist"].max_speed == pytest.approx(0.0, abs=1e-9)
+    assert [segment.kind for segment in result.segments] == ["static", "dynamic"]
+    assert result.dynamic_time_s == pytest.approx(1.0, abs=0.15)
+    assert result.hip_to_wall_distance is not None
+    assert result.hip_to_wall_distance.mean == pytest.approx(0.0, abs=1e-9)
+    assert len(result.center_of_mass) == 20
+
+
+def test_service_caches_until_keypoints_change(tmp_path: Path) -> None:
+    path = _write_keypoints(tmp_path / "v1" / "keypoints.json")
+    service = ClimbMetricsService(tmp_path)
+
+    first = service.analyze_video("v1", model="mediapipe")
+    assert service.analyze_video("v1", model="MediaPipe") is first
+
+    _write_keypoints(path, fps=20.0)
+    assert service.analyze_video("v1", model="mediapipe").fps == 20.0
+
+    with pytest.raises(FileNotFoundError):
+        service.analyze_video("v1", model="openpose")
+
+
+def test_analysis_endpoint(
+    client: TestClient,
+    manager: JobManager,
+    sample_video: Path,
+    wait_for_job: Callable[[str], dict],
+) -> None:
+    assert client.get("/api/v1/analysis/videos/missing").status_code == 404
+
+    video_id, input_path = manager.register_local_video(sample_video)
+    record = manager.start_job(video_id=video_id, input_path=input_path, model="mediapipe")
+    assert wait_for_job(record.job_id)["status"] == "completed"
+
+    response = client.get(f"/api/v1/analysis/videos/{video_id}", params={"model": "mediapipe"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_frames"] == 8
+    assert "left_hip" in body["joints"]
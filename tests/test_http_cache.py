@@ -0,0 +1,130 @@
+import gzip
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.http_cache import IMMUTABLE_CACHE_CONTROL, _parse_range
+from app.services.job_manager import JobManager
+from conftest import SlowModel
+
+
+@pytest.fixture
+def outputs(manager: JobManager) -> str:
+    video_id = "cached"
+    out = manager.outputs_dir / video_id
+    out.mkdir(parents=True)
+    frames = [{"frame_index": i, "keypoints": []} for i in range(200)]
+    (out / "keypoints.json").write_text(json.dumps({"video_id": video_id, "frames": frames}), encoding="utf-8")
+    (out / "overlay.mp4").write_bytes(bytes(range(256)) * 16)
+    return video_id
+
+
+def test_parse_range() -> None:
+    assert _parse_range("bytes=0-9", 100) == (0, 9)
+    assert _parse_range("bytes=90-", 100) == (90, 99)
+    assert _parse_range("bytes=-10", 100) == (90, 99)
+    assert _parse_range("bytes=50-500", 100) == (50, 99)
+    assert _parse_range("bytes=0-1,5-6", 100) is None
+    assert _parse_range("items=0-1", 100) is None
+    with pytest.raises(ValueError):
+        _parse_range("bytes=100-", 100)
+
+
+def test_download_revalidates_with_etag(client: TestClient, outputs: str) -> None:
+    url = f"/api/v1/videos/{outputs}/download"
+    first = client.get(url, params={"type": "overlay"})
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "no-cache"
+    assert first.headers["accept-ranges"] == "bytes"
+
+    again = client.get(url, params={"type": "overlay"}, headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    since = client.get(url, params={"type": "overlay"}, headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert since.status_code == 304
+
+
+def test_download_range(client: TestClient, manager: JobManager, outputs: str) -> None:
+    url = f"/api/v1/videos/{outputs}/download"
+    body = (manager.outputs_dir / outputs / "overlay.mp4").read_bytes()
+
+    partial = client.get(url, params={"type": "overlay"}, headers={"Range": "bytes=100-199"})
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == f"bytes 100-199/{len(body)}"
+    assert partial.content == body[100:200]
+
+    etag = partial.headers["etag"]
+    stale = client.get(url, params={"type": "overlay"}, headers={"Range": "bytes=0-9", "If-Range": '"old"'})
+    assert stale.status_code == 200
+    assert stale.content == body
+    fresh = client.get(url, params={"type": "overlay"}, headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert fresh.status_code == 206
+
+    unsatisfiable = client.get(url, params={"type": "overlay"}, headers={"Range": f"bytes={len(body)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(body)}"
+
+
+def test_keypoints_are_gzipped_and_versioned_urls_are_immutable(
+    client: TestClient, manager: JobManager, outputs: str
+) -> None:
+    results = client.get(f"/api/v1/videos/{outputs}/results").json()
+    version = results["versions"]["keypoints"]
+
+    url = f"/api/v1/videos/{outputs}/download"
+    response = client.get(
+        url,
+        params={"type": "keypoints", "v": version},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.json()["video_id"] == outputs  # decoded by the client
+    source = manager.outputs_dir / outputs / "keypoints.json"
+    sidecar = source.with_name("keypoints.json.gz")
+    assert gzip.decompress(sidecar.read_bytes()) == source.read_bytes()
+
+    identity = client.get(url, params={"type": "keypoints"}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] != response.headers["etag"]
+
+    source.write_text(json.dumps({"video_id": outputs, "frames": [], "pad": "x" * 2048}), encoding="utf-8")
+    rebuilt = client.get(url, params={"type": "keypoints", "v": version}, headers={"Accept-Encoding": "gzip"})
+    assert rebuilt.headers["cache-control"] == "no-cache"
+    assert rebuilt.json()["frames"] == []
+
+
+def test_json_endpoints_answer_304(client: TestClient, outputs: str) -> None:
+    url = f"/api/v1/videos/{outputs}/results"
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "no-cache"
+    assert client.get(url, headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+
+def test_job_status_etag_changes_with_status(
+    client: TestClient,
+    manager: JobManager,
+    sample_video: Path,
+    wait_for_job: Callable[[str], dict],
+    slow_model: type[SlowModel],
+) -> None:
+    manager.registry.register("slow", slow_model)
+    video_id, _ = manager.register_local_video(sample_video)
+    job_id = client.post(f"/api/v1/videos/{video_id}/process", params={"model": "slow"}).json()["job_id"]
+    queued = client.get(f"/api/v1/jobs/{job_id}")
+    assert queued.json()["status"] in {"pending", "running"}
+
+    slow_model.gate.set()
+    assert wait_for_job(job_id)["status"] == "completed"
+
+    done = client.get(f"/api/v1/jobs/{job_id}", headers={"If-None-Match": queued.headers["etag"]})
+    assert done.status_code == 200
+    assert done.headers["etag"] != queued.headers["etag"]
+    assert client.get(f"/api/v1/jobs/{job_id}", headers={"If-None-Match": done.headers["etag"]}).status_code == 304
@@ -0,0 +1,193 @@
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.schemas.pose import JobStatus, ProcessingConfig
+from app.services.job_manager import JobManager, JobRecord
+from app.services.job_queue import SQLiteJobQueue
+from app.worker import Worker
+from conftest import SlowModel
+
+
+@pytest.fixture
+def job_queue(tmp_path: Path) -> SQLiteJobQueue:
+    return SQLiteJobQueue(tmp_path / "jobs.sqlite3")
+
+
+@pytest.fixture
+def manager(make_manager: Callable[..., JobManager], job_queue: SQLiteJobQueue) -> JobManager:
+    """The API side: enqueues into the queue instead of running jobs."""
+    return make_manager(job_queue=job_queue)
+
+
+@pytest.fixture
+def worker(make_manager: Callable[..., JobManager], job_queue: SQLiteJobQueue) -> Worker:
+    """A worker over the same data dirs with its own in-process JobManager."""
+    return Worker(make_manager(), job_queue, worker_id="w1", heartbeat_interval=0.01)
+
+
+def test_claim_is_exclusive_and_finish_requires_ownership(job_queue: SQLiteJobQueue, tmp_path: Path) -> None:
+    job_queue.enqueue("j1", "v1", "mediapipe", tmp_path / "v1.mp4", ProcessingConfig(model="mediapipe"))
+
+    claimed = job_queue.claim("w1")
+    assert claimed is not None and claimed.job_id == "j1" and claimed.attempts == 1
+    assert claimed.config.model == "mediapipe"
+    assert job_queue.claim("w2") is None
+    assert job_queue.get("j1").status == JobStatus.running
+
+    assert job_queue.heartbeat("j1", "w1", {"preview_overlay": "x"})
+    assert not job_queue.heartbeat("j1", "w2")
+    assert job_queue.get("j1").outputs == {"preview_overlay": "x"}
+
+    record = job_queue.get("j1")
+    record.status = JobStatus.completed
+    assert not job_queue.finish(record, "w2")
+    assert job_queue.finish(record, "w1")
+    assert job_queue.get("j1").status == JobStatus.completed
+
+
+def test_enqueue_stores_absolute_input_paths(job_queue: SQLiteJobQueue) -> None:
+    job_queue.enqueue("j1", "v1", "mediapipe", Path("data/uploads/v1.mp4"), ProcessingConfig(model="mediapipe"))
+    claimed = job_queue.claim("w1")
+    assert claimed is not None
+    assert claimed.input_path == Path("data/uploads/v1.mp4").resolve()
+
+
+def test_claim_filters_by_model(job_queue: SQLiteJobQueue, tmp_path: Path) -> None:
+    job_queue.enqueue("j1", "v1", "OpenPose", tmp_path / "v1.mp4", ProcessingConfig(model="openpose"))
+    assert job_queue.claim("w1", ["mediapipe"]) is None
+    claimed = job_queue.claim("w1", ["openpose"])
+    assert claimed is not None and claimed.job_id == "j1"
+
+
+def test_workers_do_not_run_the_same_video_at_once(job_queue: SQLiteJobQueue, tmp_path: Path) -> None:
+    config = ProcessingConfig(model="mediapipe")
+    job_queue.enqueue("j1", "v1", "mediapipe", tmp_path / "v1.mp4", config)
+    job_queue.enqueue("j2", "v1", "openpose", tmp_path / "v1.mp4", config)
+    job_queue.enqueue("j3", "v2", "mediapipe", tmp_path / "v2.mp4", config)
+
+    first = job_queue.claim("w1")
+    second = job_queue.claim("w2")
+    assert first is not None and first.job_id == "j1"
+    assert second is not None and second.job_id == "j3"
+    assert job_queue.claim("w3") is None
+
+    record = job_queue.get("j1")
+    record.status = JobStatus.completed
+    assert job_queue.finish(record, "w1")
+    third = job_queue.claim("w3")
+    assert third is not None and third.job_id == "j2"
+
+
+def test_stale_jobs_are_reclaimed_then_failed(tmp_path: Path) -> None:
+    job_queue = SQLiteJobQueue(tmp_path / "stale.sqlite3", stale_seconds=0.01, max_attempts=2)
+    job_queue.enqueue("j1", "v1", "mediapipe", tmp_path / "v1.mp4", ProcessingConfig(model="mediapipe"))
+
+    assert job_queue.claim("w1") is not None
+    time.sleep(0.05)
+    second = job_queue.claim("w2")
+    assert second is not None and second.attempts == 2
+    assert not job_queue.heartbeat("j1", "w1")
+
+    time.sleep(0.05)
+    assert job_queue.reclaim_stale() == 1
+    failed = job_queue.get("j1")
+    assert failed.status == JobStatus.failed
+    assert "Abandoned" in (failed.error or "")
+
+
+def test_worker_stops_rendering_when_its_lease_is_lost(
+    worker: Worker,
+    job_queue: SQLiteJobQueue,
+    manager: JobManager,
+    sample_video: Path,
+    slow_model: type[SlowModel],
+) -> None:
+    slow_model.latency = 0.1  # frames keep coming so the cancel is seen mid-render
+    slow_model.gate.set()
+    worker.manager.registry.register("slow", slow_model)
+    video_id, input_path = manager.register_local_video(sample_video)
+    job_queue.enqueue("j1", video_id, "slow", input_path, ProcessingConfig(model="slow"))
+
+    thread = threading.Thread(target=worker.run_once)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while job_queue.get("j1").status != JobStatus.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Simulate another worker reclaiming the job.
+    with sqlite3.connect(job_queue.path) as conn:
+        conn.execute("UPDATE jobs SET worker_id = 'w2' WHERE job_id = 'j1'")
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert job_queue.get("j1").status == JobStatus.running  # still w2's to finish
+    out = manager.outputs_dir / video_id
+    assert not out.exists() or not any(out.iterdir())
+
+
+def test_worker_retries_failed_heartbeats_then_cancels_once_stale(
+    worker: Worker, job_queue: SQLiteJobQueue, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = 0
+
+    def locked(*args: object) -> bool:
+        nonlocal calls
+        calls += 1
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(job_queue, "heartbeat", locked)
+    monkeypatch.setattr(job_queue, "stale_seconds", 0.2)
+    record = JobRecord(job_id="j1", video_id="v1", model="mediapipe")
+    done, cancel = threading.Event(), threading.Event()
+
+    thread = threading.Thread(target=worker._heartbeat, args=(record, done, cancel))
+    thread.start()
+    assert cancel.wait(5)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert calls > 1  # retried before giving up
+
+
+def test_api_enqueues_and_worker_reports_back(
+    client: TestClient, manager: JobManager, worker: Worker, sample_video: Path
+) -> None:
+    video_id, _ = manager.register_local_video(sample_video)
+
+    response = client.post(f"/api/v1/videos/{video_id}/process", params={"model": "mediapipe"})
+    assert response.status_code == 200
+    job_id = response.json()["job_id"]
+    assert client.get(f"/api/v1/jobs/{job_id}").json()["status"] == "pending"
+
+    worker.run(threading.Event(), drain=True)
+
+    body = client.get(f"/api/v1/jobs/{job_id}").json()
+    assert body["status"] == "completed", body["error"]
+    assert Path(body["outputs"]["keypoints"]).exists()
+    assert body["timings"]["total"] > 0
+    assert client.get(f"/api/v1/videos/{video_id}/results").status_code == 200
+
+
+def test_batch_is_tracked_through_the_queue(
+    client: TestClient, manager: JobManager, worker: Worker, sample_video: Path
+) -> None:
+    video_ids = [manager.register_local_video(sample_video)[0] for _ in range(2)]
+
+    response = client.post(
+        "/api/v1/batches",
+        json={"items": [{"video_id": video_id, "model": "mediapipe"} for video_id in video_ids]},
+    )
+    assert response.status_code == 200
+    batch_id = response.json()["batch_id"]
+    assert client.get(f"/api/v1/batches/{batch_id}").json()["status"] == "pending"
+
+    worker.run(threading.Event(), drain=True)
+
+    body = client.get(f"/api/v1/batches/{batch_id}").json()
+    assert body["status"] == "completed"
+    assert body["counts"]["completed"] == 2
+    assert client.get("/api/v1/batches/unknown").status_code == 404
@@ -0,0 +1,150 @@
+import json
+import os
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import local_sources
+from app.services.job_manager import JobManager
+
+
+def _mode(mode: str, verify: str = "stat") -> pytest.MarkDecorator:
+    return pytest.mark.parametrize(
+        "manager", [{"local_registration_mode": mode, "local_verify": verify}], indirect=True
+    )
+
+
+def _wait_for_hash(reference: Path, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not json.loads(reference.read_text(encoding="utf-8"))["sha256"]:
+        assert time.monotonic() < deadline, "hash was never recorded"
+        time.sleep(0.01)
+
+
+@_mode("auto")
+def test_auto_mode_hardlinks_on_same_filesystem(manager: JobManager, sample_video: Path) -> None:
+    video_id, path = manager.register_local_video(sample_video)
+
+    assert path.parent == manager.uploads_dir
+    assert path.samefile(sample_video)
+    assert manager.resolve_uploaded_video(video_id) == path
+
+
+@_mode("reference")
+def test_reference_mode_detects_changed_source(
+    client: TestClient, manager: JobManager, sample_video: Path
+) -> None:
+    video_id, path = manager.register_local_video(sample_video)
+    assert path == sample_video
+    assert manager.resolve_uploaded_video(video_id) == sample_video
+
+    with sample_video.open("ab") as handle:
+        handle.write(b"\0")
+    with pytest.raises(ValueError):
+        manager.resolve_uploaded_video(video_id)
+
+    response = client.post(f"/api/v1/videos/{video_id}/process", params={"model": "mediapipe"})
+    assert response.status_code == 409
+    batch = client.post("/api/v1/batches", json={"items": [{"video_id": video_id, "model": "mediapipe"}]})
+    assert batch.status_code == 409
+
+
+@_mode("reference", verify="hash")
+def test_hash_verify_accepts_touched_source(
+    client: TestClient,
+    manager: JobManager,
+    sample_video: Path,
+    wait_for_job: Callable[[str], dict],
+) -> None:
+    video_id, _ = manager.register_local_video(sample_video)
+    _wait_for_hash(manager.uploads_dir / f"{video_id}.ref.json")
+
+    stat = sample_video.stat()
+    os.utime(sample_video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert manager.resolve_uploaded_video(video_id) == sample_video
+
+    job_id = client.post(f"/api/v1/videos/{video_id}/process", params={"model": "mediapipe"}).json()["job_id"]
+    assert wait_for_job(job_id)["status"] == "completed"
+
+
+@_mode("reference", verify="hash")
+def test_hash_verify_rejects_rewritten_source_on_job_thread(
+    client: TestClient,
+    manager: JobManager,
+    sample_video: Path,
+    wait_for_job: Callable[[str], dict],
+) -> None:
+    video_id, _ = manager.register_local_video(sample_video)
+    _wait_for_hash(manager.uploads_dir / f"{video_id}.ref.json")
+
+    data = bytearray(sample_video.read_bytes())
+    data[-1] ^= 0xFF
+    sample_video.write_bytes(bytes(data))
+    stat = sample_video.stat()
+    os.utime(sample_video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    # Same size, so the request path defers to the hash, which the job then rejects.
+    response = client.post(f"/api/v1/videos/{video_id}/process", params={"model": "mediapipe"})
+    assert response.status_code == 200
+    job = wait_for_job(response.json()["job_id"])
+    assert job["status"] == "failed"
+    assert "changed" in job["error"]
+
+
+@_mode("copy")
+def test_copy_mode_copies_off_request_thread(manager: JobManager, sample_video: Path) -> None:
+    video_id, path = manager.register_local_video(sample_video)
+    assert path == sample_video
+
+    reference = manager.uploads_dir / f"{video_id}.ref.json"
+    deadline = time.monotonic() + 10
+    while reference.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    copied = manager.resolve_uploaded_video(video_id)
+    assert copied.parent == manager.uploads_dir
+    assert copied.read_bytes() == sample_video.read_bytes()
+    assert not copied.samefile(sample_video)
+    assert sorted(p.name for p in manager.uploads_dir.iterdir()) == [copied.name]
+
+
+def test_record_hash_does_not_restore_a_dropped_reference(
+    tmp_path: Path, sample_video: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    reference = tmp_path / f"v1{local_sources.REFERENCE_SUFFIX}"
+    local_sources.write_reference(reference, sample_video)
+    hash_file = local_sources.sha256_file
+
+    def hash_while_copy_finishes(path: Path) -> str:
+        digest = hash_file(path)
+        reference.unlink()  # copy_into_place dropped the reference meanwhile
+        return digest
+
+    monkeypatch.setattr(local_sources, "sha256_file", hash_while_copy_finishes)
+    local_sources.record_hash(reference)
+    assert not reference.exists()
+    assert not list(tmp_path.glob("*.partial"))
+
+
+@_mode("copy")
+def test_job_reading_the_copy_ignores_the_original_source(
+    client: TestClient,
+    manager: JobManager,
+    sample_video: Path,
+    wait_for_job: Callable[[str], dict],
+) -> None:
+    video_id, _ = manager.register_local_video(sample_video)
+    reference = manager.uploads_dir / f"{video_id}.ref.json"
+    deadline = time.monotonic() + 10
+    while reference.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # A stale reference next to the finished copy must not tie the job to the moved original.
+    local_sources.write_reference(reference, sample_video)
+    sample_video.rename(sample_video.with_name("moved.mp4"))
+
+    job_id = client.post(f"/api/v1/videos/{video_id}/process", params={"model": "mediapipe"}).json()["job_id"]
+    assert wait_for_job(job_id)["status"] == "completed"
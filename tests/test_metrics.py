@@ -0,0 +1,44 @@
+from collections.abc import Callable
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.metrics import MetricsRegistry
+from app.services.job_manager import JobManager
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="a")
+    histogram.observe(0.5, stage="a")
+    histogram.observe(5.0, stage="a")
+
+    text = registry.render()
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{stage="a",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="a",le="1.0"} 2' in text
+    assert 'demo_seconds_bucket{stage="a",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{stage="a"} 3' in text
+
+
+def test_job_reports_timings_and_metrics_endpoint(
+    client: TestClient,
+    manager: JobManager,
+    sample_video: Path,
+    wait_for_job: Callable[[str], dict],
+) -> None:
+    video_id, input_path = manager.register_local_video(sample_video)
+    record = manager.start_job(video_id=video_id, input_path=input_path, model="mediapipe")
+
+    job = wait_for_job(record.job_id)
+    assert job["status"] == "completed"
+    assert {"decode", "infer", "visualize", "encode", "serialize", "total"} <= set(job["timings"])
+    assert job["frames_per_second"] > 0
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'betagen_pipeline_stage_seconds_count{stage="infer"}' in response.text
+    assert "betagen_jobs_running" in response.text
+    assert 'betagen_model_load_seconds_count{model="mediapipe"}' in response.text
@@ -0,0 +1,119 @@
+import json
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.models.pose.mediapipe_model import MediaPipePoseModel
+from app.pipelines.video_processor import VideoProcessor
+from app.schemas.pose import PoseResult
+from app.services.job_manager import JobManager
+from conftest import SlowModel
+
+
+class BrokenModel(MediaPipePoseModel):
+    name = "broken"
+
+    def infer(self, frame) -> PoseResult:  # type: ignore[no-untyped-def]
+        raise RuntimeError("inference failed")
+
+
+def test_width_only_resolution_keeps_aspect_ratio() -> None:
+    assert VideoProcessor._resolve_output_resolution("480", 1920, 1080) == (480, 270)
+    assert VideoProcessor._resolve_output_resolution("4000", 64, 48) == (64, 48)
+    assert VideoProcessor._resolve_output_resolution("320x200", 64, 48) == (320, 200)
+
+
+def test_preview_is_published_before_full_render(
+    client: TestClient,
+    manager: JobManager,
+    sample_video: Path,
+    wait_for_job: Callable[[str], dict],
+    slow_model: type[SlowModel],
+) -> None:
+    slow_model.free_streams = 1  # let the preview through, hold the full render
+    manager.registry.register("slow", slow_model)
+    video_id, _ = manager.register_local_video(sample_video)
+
+    response = client.post(
+        f"/api/v1/videos/{video_id}/process",
+        params={"model": "slow"},
+        json={"preview": True},
+    )
+    job_id = response.json()["job_id"]
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/v1/jobs/{job_id}").json()
+        if "preview_overlay" in job["outputs"]:
+            break
+        time.sleep(0.02)
+
+    assert job["status"] == "running"
+    files = client.get(f"/api/v1/videos/{video_id}/results").json()["files"]
+    assert {"preview_overlay", "preview_keypoints"} <= set(files)
+    assert "overlay" not in files
+
+    slow_model.gate.set()
+    job = wait_for_job(job_id)
+    assert job["status"] == "completed"
+    assert {"overlay", "keypoints", "preview_overlay", "preview_keypoints"} <= set(job["outputs"])
+    assert "preview" in job["timings"]
+
+    preview = json.loads(Path(job["outputs"]["preview_keypoints"]).read_text())
+    assert preview["meta"]["every_n_frames"] == 5
+    download = client.get(f"/api/v1/videos/{video_id}/download", params={"type": "preview_overlay"})
+    assert download.status_code == 200
+
+
+def test_reprocessing_drops_artifacts_the_new_run_does_not_produce(
+    client: TestClient,
+    manager: JobManager,
+    sample_video: Path,
+    wait_for_job: Callable[[str], dict],
+    slow_model: type[SlowModel],
+) -> None:
+    manager.registry.register("slow", slow_model)
+    video_id, _ = manager.register_local_video(sample_video)
+    url = f"/api/v1/videos/{video_id}/process"
+
+    first = client.post(url, params={"model": "mediapipe"}, json={"preview": True, "profile": True})
+    assert wait_for_job(first.json()["job_id"])["status"] == "completed"
+    files = client.get(f"/api/v1/videos/{video_id}/results").json()["files"]
+    assert {"overlay", "preview_overlay", "profile"} <= set(files)
+
+    job_id = client.post(url, params={"model": "slow"}).json()["job_id"]
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        files = client.get(f"/api/v1/videos/{video_id}/results").json()["files"]
+        if "preview_overlay" not in files:
+            break
+        time.sleep(0.02)
+    assert client.get(f"/api/v1/jobs/{job_id}").json()["status"] == "running"
+    assert set(files) == {"overlay", "keypoints"}  # the last good results stay until replaced
+
+    slow_model.gate.set()
+    assert wait_for_job(job_id)["status"] == "completed"
+    files = client.get(f"/api/v1/videos/{video_id}/results").json()["files"]
+    assert set(files) == {"overlay", "keypoints"}
+
+
+def test_failed_reprocess_keeps_previous_results(
+    client: TestClient,
+    manager: JobManager,
+    sample_video: Path,
+    wait_for_job: Callable[[str], dict],
+) -> None:
+    manager.registry.register("broken", BrokenModel)
+    video_id, _ = manager.register_local_video(sample_video)
+    url = f"/api/v1/videos/{video_id}/process"
+
+    assert wait_for_job(client.post(url, params={"model": "mediapipe"}).json()["job_id"])["status"] == "completed"
+    keypoints = manager.outputs_dir / video_id / "keypoints.json"
+    before = keypoints.read_bytes()
+
+    assert wait_for_job(client.post(url, params={"model": "broken"}).json()["job_id"])["status"] == "failed"
+    files = client.get(f"/api/v1/videos/{video_id}/results").json()["files"]
+    assert set(files) == {"overlay", "keypoints"}
+    assert keypoints.read_bytes() == before
@@ -0,0 +1,49 @@
+import pstats
+from collections.abc import Callable
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+
+def test_profiled_job_exposes_downloadable_profile(
+    client: TestClient,
+    sample_video: Path,
+    wait_for_job: Callable[[str], dict],
+    tmp_path: Path,
+) -> None:
+    response = client.post(
+        "/api/v1/videos/process-local",
+        json={"local_path": str(sample_video), "model": "mediapipe", "profile": True},
+    )
+    assert response.status_code == 200
+    body = response.json()
+
+    job = wait_for_job(body["job_id"])
+    assert job["status"] == "completed"
+    assert {"profile", "profile_summary"} <= set(job["outputs"])
+
+    video_id = body["video_id"]
+    summary = client.get(f"/api/v1/videos/{video_id}/download", params={"type": "profile_summary"})
+    assert summary.status_code == 200
+    assert "process_rss_peak_during_job_mb" in summary.text
+
+    profile = client.get(f"/api/v1/videos/{video_id}/download", params={"type": "profile"})
+    assert profile.status_code == 200
+    dumped = tmp_path / "downloaded.prof"
+    dumped.write_bytes(profile.content)
+    assert pstats.Stats(str(dumped)).total_calls > 0
+
+
+def test_unprofiled_job_has_no_profile(
+    client: TestClient,
+    sample_video: Path,
+    wait_for_job: Callable[[str], dict],
+) -> None:
+    body = client.post(
+        "/api/v1/videos/process-local",
+        json={"local_path": str(sample_video), "model": "mediapipe"},
+    ).json()
+    wait_for_job(body["job_id"])
+
+    response = client.get(f"/api/v1/videos/{body['video_id']}/download", params={"type": "profile"})
+    assert response.status_code == 404
@@ -0,0 +1,142 @@
+import json
+import math
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main
+from app.api.deps import get_similarity_index
+from app.services.job_manager import JobManager
+from app.services.similarity import SimilarityIndex, dtw_distance
+
+
+def _write_climb(outputs_dir: Path, video_id: str, motion: Callable[[float], tuple[float, float]]) -> None:
+    frames = []
+    for i in range(40):
+        dx, dy = motion(i / 39)
+        points = {
+            "11": (90, 200), "12": (110, 200), "23": (90, 300), "24": (110, 300),
+            "15": (60 + dx, 120 - dy), "16": (140 - dx, 120 - dy),
+        }
+        frames.append(
+            {
+                "frame_index": i,
+                "keypoints": [{"name": n, "x": x, "y": y, "confidence": 0.9} for n, (x, y) in points.items()],
+            }
+        )
+    path = outputs_dir / video_id / "keypoints.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"video_id": video_id, "model": "mediapipe", "frames": frames, "meta": {"fps": 10}}))
+
+
+def test_query_finds_time_warped_copy_and_matches_brute_force(tmp_path: Path) -> None:
+    _write_climb(tmp_path, "base", lambda s: (40 * s, 80 * math.sin(math.pi * s)))
+    _write_climb(tmp_path, "warped", lambda s: (40 * s**1.3, 80 * math.sin(math.pi * s**1.3)))
+    rng = np.random.default_rng(1)
+    for n in range(30):
+        a, b = rng.uniform(-120, 120, size=2)
+        _write_climb(tmp_path, f"other{n}", lambda s, a=a, b=b: (a * s, b * math.cos(3 * s)))
+
+    index = SimilarityIndex(tmp_path)
+    index.sync()
+    result = index.query("base", k=3)
+
+    assert result.candidates == 31
+    assert result.results[0].video_id == "warped"
+    assert result.dtw_evaluations < result.candidates
+
+    query = index._embeddings["base"]
+    exact = sorted(
+        (math.sqrt(dtw_distance(query, emb, index.window)), vid)
+        for vid, emb in index._embeddings.items()
+        if vid != "base"
+    )[:3]
+    assert [r.video_id for r in result.results] == [vid for _, vid in exact]
+    assert [r.distance for r in result.results] == [d for d, _ in exact]
+
+
+def test_sync_reuses_stored_embeddings(tmp_path: Path) -> None:
+    _write_climb(tmp_path, "a", lambda s: (10 * s, 0))
+    first = SimilarityIndex(tmp_path)
+    first.sync()
+    stored = tmp_path / ".similarity" / "a.npy"
+    mtime = stored.stat().st_mtime_ns
+
+    second = SimilarityIndex(tmp_path)
+    second.sync()
+    assert stored.stat().st_mtime_ns == mtime
+    assert np.array_equal(second._embeddings["a"], first._embeddings["a"])
+
+
+def test_similar_endpoint_indexes_completed_jobs(
+    client: TestClient,
+    manager: JobManager,
+    sample_video: Path,
+    wait_for_job: Callable[[str], dict],
+) -> None:
+    assert client.get("/api/v1/climbs/unknown/similar").status_code == 404
+
+    video_ids = []
+    for _ in range(2):
+        video_id, path = manager.register_local_video(sample_video)
+        record = manager.start_job(video_id=video_id, input_path=path, model="mediapipe")
+        assert wait_for_job(record.job_id)["status"] == "completed"
+        video_ids.append(video_id)
+
+    response = client.get(f"/api/v1/climbs/{video_ids[0]}/similar", params={"k": 1})
+    assert response.status_code == 200
+    assert [r["video_id"] for r in response.json()["results"]] == [video_ids[1]]
+
+
+def test_lifespan_and_requests_share_one_index(
+    client: TestClient, manager: JobManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(app.main, "get_job_manager", lambda: manager)
+    get_similarity_index.cache_clear()
+    with client:
+        assert client.get("/api/v1/climbs/unknown/similar").status_code == 404
+    assert get_similarity_index.cache_info().misses == 1
+    assert len(manager._completion_listeners) == 1
+
+
+def test_query_picks_up_keypoints_written_by_other_processes(tmp_path: Path) -> None:
+    _write_climb(tmp_path, "a", lambda s: (10 * s, 0))
+    index = SimilarityIndex(tmp_path, refresh_seconds=0.0)
+    index.sync()
+
+    # Written after the index was built and without a completion listener, as a queue worker would.
+    _write_climb(tmp_path, "b", lambda s: (12 * s, 0))
+    assert [r.video_id for r in index.query("b", k=1).results] == ["a"]
+
+    assert index._sync_thread is not None
+    index._sync_thread.join()
+    _write_climb(tmp_path, "c", lambda s: (0, 30 * s))
+    (tmp_path / "b" / "keypoints.json").unlink()
+    index.query("a")  # starts a fresh background sync
+    index._sync_thread.join()
+    result = index.query("a", k=5)
+    assert {r.video_id for r in result.results} == {"c"}
+    assert not (tmp_path / ".similarity" / "b.npy").exists()
+
+
+def test_concurrent_syncs_do_not_collide_and_skip_bad_videos(tmp_path: Path) -> None:
+    for n in range(40):
+        _write_climb(tmp_path, f"v{n}", lambda s, n=n: (n * s, 0))
+    (tmp_path / "broken").mkdir()
+    (tmp_path / "broken" / "keypoints.json").write_text("{", encoding="utf-8")
+
+    indexes = [SimilarityIndex(tmp_path) for _ in range(2)]
+    threads = [threading.Thread(target=index.sync) for index in indexes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for index in indexes:
+        assert index._last_sync is not None
+        assert set(index._embeddings) == {f"v{n}" for n in range(40)}
+    assert not list((tmp_path / ".similarity").glob(".*partial*"))
@@ -0,0 +1,42 @@
+import subprocess
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from app.models.registry import PoseModelRegistry
+from app.services.job_manager import JobManager
+
+
+def test_importing_app_does_not_load_heavy_dependencies() -> None:
+    code = (
+        "import sys, app.main; "
+        "print(','.join(m for m in ('cv2', 'numpy', 'mediapipe') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_registry_reuses_released_instances() -> None:
+    registry = PoseModelRegistry()
+    first = registry.acquire("mediapipe")
+    second = registry.acquire("mediapipe")
+    assert first is not second
+
+    registry.release("mediapipe", first)
+    assert registry.acquire("MediaPipe") is first
+
+
+def test_readiness_reports_warming_until_prewarm_finishes(client: TestClient, manager: JobManager) -> None:
+    assert client.get("/health/ready").json() == {"status": "ready", "models": {}}
+
+    manager.prewarm(["mediapipe"])
+    deadline = time.monotonic() + 10
+    response = client.get("/health/ready")
+    while response.status_code != 200 and time.monotonic() < deadline:
+        assert response.json()["status"] == "warming"
+        time.sleep(0.02)
+        response = client.get("/health/ready")
+
+    assert response.json() == {"status": "ready", "models": {"mediapipe": "warm"}}
+    assert client.get("/health").json() == {"status": "ok"}
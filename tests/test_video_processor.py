@@ -0,0 +1,49 @@
+import json
+from pathlib import Path
+
+import cv2
+
+from app.models.registry import PoseModelRegistry
+from app.pipelines.video_processor import VideoProcessor
+from app.schemas.pose import EncodingOptions, ProcessingConfig
+
+
+def _frame_count(path: Path) -> int:
+    capture = cv2.VideoCapture(str(path))
+    try:
+        return int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        capture.release()
+
+
+def test_frame_and_overlay_strides(sample_video: Path, tmp_path: Path) -> None:
+    processor = VideoProcessor(PoseModelRegistry(), max_video_seconds=60, frame_writer_max_pending=2)
+    config = ProcessingConfig(
+        model="mediapipe",
+        save_intermediate_frames=True,
+        encoding=EncodingOptions(frame_stride=3, frame_jpeg_quality=50, output_frame_stride=2),
+    )
+
+    outputs = processor.process_video("vid", sample_video, tmp_path / "out", config)
+
+    frames = sorted(p.name for p in Path(outputs["frames_dir"]).iterdir())
+    assert frames == ["000000.jpg", "000003.jpg", "000006.jpg"]
+    assert _frame_count(Path(outputs["overlay"])) == 4
+
+    meta = json.loads(Path(outputs["keypoints"]).read_text())["meta"]
+    assert meta["total_frames"] == 8
+    assert meta["overlay_fps"] == 5.0
+
+
+def test_jpeg_quality_changes_frame_size(sample_video: Path, tmp_path: Path) -> None:
+    processor = VideoProcessor(PoseModelRegistry(), max_video_seconds=60)
+    sizes = {}
+    for quality in (10, 100):
+        config = ProcessingConfig(
+            model="mediapipe",
+            save_intermediate_frames=True,
+            encoding=EncodingOptions(frame_jpeg_quality=quality),
+        )
+        outputs = processor.process_video("vid", sample_video, tmp_path / str(quality), config)
+        sizes[quality] = sum(p.stat().st_size for p in Path(outputs["frames_dir"]).iterdir())
+    assert sizes[10] < sizes[100]